@@ -21,19 +21,28 @@ Date: 2026-02-03
 """
 
 import argparse
+import contextlib
+import copy
+import functools
+import hashlib
 import json
+import logging
 import os
+import random
 import re
+import sqlite3
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from threading import Lock
 
 import dspy
+import networkx as nx
 from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
 
+from bdi_llm.api_budget import api_call_slot, set_api_concurrency, set_api_qps
 from bdi_llm.config import Config
 from bdi_llm.plan_repair import repair_and_verify
 from bdi_llm.planbench_eval_runtime import (
@@ -52,8 +61,16 @@ from bdi_llm.planner.domain_spec import (
 )
 from bdi_llm.planning_task import PDDLPlanSerializer, PlanningTask
 from bdi_llm.schemas import BDIPlan
+from bdi_llm.symbolic_verifier import (
+    BlocksworldPhysicsValidator,
+    IntegratedVerifier,
+    PDDLSymbolicVerifier,
+)
+from bdi_llm.val_runner import EMPTY_PLAN_ERROR
 from bdi_llm.verifier import PlanVerifier
 
+logger = logging.getLogger(__name__)
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 PLANBENCH_ROOT = PROJECT_ROOT / "workspaces" / "planbench_data" / "plan-bench"
 BUILTIN_PLAN_DOMAINS = {"blocksworld", "logistics", "depots"}
@@ -63,6 +80,23 @@ STAGE_RESULT_KEYS = {
     "bdi": "bdi_initial_result",
     "bdi-repair": "bdi_repair_result",
 }
+# Exponential backoff schedule (seconds) for retryable API errors; jitter is
+# added per retry so concurrent workers do not re-hit the provider in lockstep.
+_BACKOFFS = tuple(2 ** (i + 1) for i in range(8))
+# Lower-cased substrings that mark an exception as a transient API failure.
+_RETRYABLE_MARKERS = ("connection", "timeout", "internal", "resourceexhausted", "429", "rate", "quota")
+# Lower-cased substrings of stage errors that say nothing about the plan itself
+# (VAL timeouts/exec failures, exhausted API retries); such results are not cached.
+_TRANSIENT_ERROR_MARKERS = (
+    "timeout",
+    "execution error",
+    "executable not found",
+    "exec format error",
+    "max retries",
+    "connection",
+    "resourceexhausted",
+    "429",
+)
 
 
 class GenerateBaselineActionSequence(dspy.Signature):
@@ -123,8 +157,8 @@ def execution_mode_flags(execution_mode: str) -> dict[str, bool]:
 
 
 def checkpoint_path(output_dir: str, domain: str, execution_mode: str) -> str:
-    """Build a per-domain pipeline checkpoint path."""
-    return f"{output_dir}/checkpoint_{domain}_pipeline.json"
+    """Build a per-domain pipeline checkpoint path (append-only JSONL)."""
+    return f"{output_dir}/checkpoint_{domain}_pipeline.jsonl"
 
 
 def stage_result_key(execution_mode: str) -> str:
@@ -190,6 +224,24 @@ def build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Disable early-exit heuristics for this run",
     )
+    parser.add_argument(
+        "--api_qps",
+        type=float,
+        default=None,
+        help="Token-bucket cap on LLM requests per second (default: unlimited)",
+    )
+    parser.add_argument(
+        "--plan_cache",
+        action="store_true",
+        help="Reuse pipeline results across runs from <output_dir>/plan_cache; "
+        "off by default so reported numbers come from this run",
+    )
+    parser.add_argument(
+        "--reuse_results",
+        action="store_true",
+        help="Skip instances already completed under the same settings by earlier runs "
+        "(<output_dir>/results.db); off by default",
+    )
     parser.add_argument(
         "--deterministic",
         action="store_true",
@@ -242,6 +294,12 @@ except ImportError:
     print("⚠️  MLflow not installed. Install with: pip install mlflow")
     print("   Experiment tracking will be disabled.")
 
+# Optional C-accelerated encoder for the per-instance checkpoint writes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ============================================================================
 # PDDL PARSING
 # ============================================================================
@@ -331,12 +389,15 @@ def parse_pddl_problem(pddl_file: str) -> dict:
     }
 
 
+@functools.cache
 def resolve_domain_file(domain_name: str, base_path: str = None) -> str:
     """Resolve the correct PDDL domain file path based on domain name.
 
     Prefers instances/<domain>/generated_domain.pddl when it exists, because
     that file's action names (pick-up / put-down) match the instance files.
     Falls back to pddlgenerators/ domain.pddl otherwise.
+
+    Memoised: a batch resolves the same domain for every instance.
     """
     if base_path is None:
         base_path = str(PLANBENCH_ROOT)
@@ -1060,6 +1121,22 @@ def _serialize_plan_nodes(plan: BDIPlan | None) -> list[dict[str, object]]:
     ]
 
 
+@functools.cache
+def _parse_domain_cached(domain: str, pddl_domain_path: str) -> tuple[DomainSpec, dict[str, list[str]]]:
+    """Parse a PDDL domain file once per (domain, path) and share the result.
+
+    ``DomainSpec`` is frozen, so the cached instance is safe to hand to
+    concurrent workers; callers must copy the param-order map before mutating.
+    """
+    domain_text = Path(pddl_domain_path).read_text()
+    domain_spec = DomainSpec.from_pddl(domain, domain_text)
+    param_order_map = {
+        action["name"]: [param_name for param_name, _ptype in action["parameters"]]
+        for action in extract_actions_from_pddl(domain_text)
+    }
+    return domain_spec, param_order_map
+
+
 def _build_domain_runtime(
     domain: str,
     pddl_domain_path: str | None,
@@ -1082,16 +1159,11 @@ def _build_domain_runtime(
     if not pddl_domain_path:
         return runtime
 
-    domain_text = Path(pddl_domain_path).read_text()
-    domain_spec = DomainSpec.from_pddl(domain, domain_text)
-    param_order_map = {
-        action["name"]: [param_name for param_name, _ptype in action["parameters"]]
-        for action in extract_actions_from_pddl(domain_text)
-    }
+    domain_spec, param_order_map = _parse_domain_cached(domain, pddl_domain_path)
     runtime["domain_context"] = domain_spec.domain_context or ""
     runtime["domain_spec"] = domain_spec
     runtime["allowed_action_names"] = {str(name).lower() for name in domain_spec.valid_action_types}
-    runtime["generic_serializer"] = PDDLPlanSerializer(param_order_map=param_order_map)
+    runtime["generic_serializer"] = PDDLPlanSerializer(param_order_map=dict(param_order_map))
     runtime["generic_task"] = PlanningTask(
         task_id=instance_id or Path(pddl_domain_path).stem,
         domain_name=domain,
@@ -1188,14 +1260,15 @@ def generate_baseline_plan(
         "If the domain is obfuscated, preserve the exact obfuscated action names. "
         "Do not invent object names. Output at least one action when a plan exists."
     )
-    pred = predictor(
-        beliefs=beliefs,
-        desire=desire,
-        domain_context=domain_context or "",
-        allowed_actions=allowed_actions_text,
-        allowed_objects=allowed_objects_text,
-        output_rules=output_rules,
-    )
+    with api_call_slot():
+        pred = predictor(
+            beliefs=beliefs,
+            desire=desire,
+            domain_context=domain_context or "",
+            allowed_actions=allowed_actions_text,
+            allowed_objects=allowed_objects_text,
+            output_rules=output_rules,
+        )
     raw_output = getattr(pred, "plan_actions", "")
     actions = _normalise_baseline_action_lines(
         raw_output,
@@ -1243,15 +1316,16 @@ def _evaluate_plan_actions(
     structural: dict | None = None,
 ) -> dict:
     """Evaluate one checkpoint and return verifier outputs with success=VAL."""
-    from bdi_llm.symbolic_verifier import BlocksworldPhysicsValidator, PDDLSymbolicVerifier
-
     layers = _default_verification_layers()
     if structural is not None:
         layers["structural"] = structural
 
     symbolic_valid = False
     symbolic_errors: list[str] = []
-    if pddl_problem_path and pddl_domain_path:
+    if pddl_problem_path and pddl_domain_path and not plan_actions:
+        # Nothing to validate: skip verifier setup and the VAL subprocess.
+        symbolic_errors = [EMPTY_PLAN_ERROR]
+    elif pddl_problem_path and pddl_domain_path:
         verifier = PDDLSymbolicVerifier()
         symbolic_valid, symbolic_errors = verifier.verify_plan(
             domain_file=pddl_domain_path,
@@ -1296,8 +1370,6 @@ def _evaluate_bdi_plan_checkpoint(
     allow_val_repair: bool,
 ) -> dict:
     """Evaluate a BDI-generated plan with optional structural and VAL repair."""
-    from bdi_llm.symbolic_verifier import IntegratedVerifier, PDDLSymbolicVerifier
-
     current_plan = plan
     result = _make_checkpoint_result("bdi")
 
@@ -1315,16 +1387,10 @@ def _evaluate_bdi_plan_checkpoint(
         repaired_plan, repaired_valid, messages = repair_and_verify(current_plan)
         result["auto_repair"]["repairs_applied"] = messages
         if repaired_valid:
+            # repair_and_verify already certified the repaired plan; skip re-verification.
             current_plan = repaired_plan
             result["auto_repair"]["success"] = True
-            graph = current_plan.to_networkx()
-            struct_result = PlanVerifier.verify(graph)
-            structural = {
-                "valid": struct_result.is_valid,
-                "errors": struct_result.errors,
-                "hard_errors": struct_result.hard_errors,
-                "warnings": struct_result.warnings,
-            }
+            structural = {"valid": True, "errors": [], "hard_errors": [], "warnings": []}
 
     plan_actions = _plan_to_pddl_actions(current_plan, domain, runtime)
     evaluation = _evaluate_plan_actions(
@@ -1342,94 +1408,94 @@ def _evaluate_bdi_plan_checkpoint(
     result["plan_nodes"] = _serialize_plan_nodes(current_plan)
 
     if allow_val_repair and not result["symbolic_valid"]:
-        verifier = PDDLSymbolicVerifier()
-        val_errors = result["verification_layers"]["symbolic"]["errors"]
-        cumulative_history: list[dict] = []
-        max_val_repairs = 5
-        for repair_attempt in range(1, max_val_repairs + 1):
-            clean_errors = [
-                err
-                for err in val_errors
-                if not str(err).lstrip().startswith("Full VAL output:")
-                and not str(err).lstrip().startswith("\nFull VAL output:")
-            ]
-            result["val_repair"]["attempts"] = repair_attempt
-            result["val_repair"]["history"].append(
-                {
-                    "attempt": repair_attempt,
-                    "errors": clean_errors[:5],
-                    "repaired": False,
-                }
-            )
-            cumulative_history.append(
-                {
-                    "attempt": repair_attempt,
-                    "plan_actions": plan_actions,
-                    "val_errors": clean_errors,
-                }
-            )
+        with PDDLSymbolicVerifier() as verifier:
+            val_errors = result["verification_layers"]["symbolic"]["errors"]
+            cumulative_history: list[dict] = []
+            max_val_repairs = 5
+            for repair_attempt in range(1, max_val_repairs + 1):
+                clean_errors = [
+                    err
+                    for err in val_errors
+                    if not str(err).lstrip().startswith("Full VAL output:")
+                    and not str(err).lstrip().startswith("\nFull VAL output:")
+                ]
+                result["val_repair"]["attempts"] = repair_attempt
+                result["val_repair"]["history"].append(
+                    {
+                        "attempt": repair_attempt,
+                        "errors": clean_errors[:5],
+                        "repaired": False,
+                    }
+                )
+                cumulative_history.append(
+                    {
+                        "attempt": repair_attempt,
+                        "plan_actions": plan_actions,
+                        "val_errors": clean_errors,
+                    }
+                )
 
-            verification_context = {
-                "layers": {
-                    "structural": {
-                        "valid": result["verification_layers"]["structural"]["valid"],
-                        "errors": result["verification_layers"]["structural"]["errors"],
+                verification_context = {
+                    "layers": {
+                        "structural": {
+                            "valid": result["verification_layers"]["structural"]["valid"],
+                            "errors": result["verification_layers"]["structural"]["errors"],
+                        },
+                        "symbolic": {
+                            "valid": False,
+                            "errors": clean_errors,
+                        },
                     },
-                    "symbolic": {
-                        "valid": False,
-                        "errors": clean_errors,
-                    },
-                },
-                "overall_valid": False,
-            }
-            failed_layers = [
-                name for name, layer in verification_context["layers"].items() if not layer.get("valid", False)
-            ]
-            verification_context["error_summary"] = (
-                f"Failed layers: {', '.join(failed_layers)}" if failed_layers else "All layers passed"
-            )
-            verification_feedback = IntegratedVerifier.build_planner_feedback(verification_context)
+                    "overall_valid": False,
+                }
+                failed_layers = [
+                    name for name, layer in verification_context["layers"].items() if not layer.get("valid", False)
+                ]
+                verification_context["error_summary"] = (
+                    f"Failed layers: {', '.join(failed_layers)}" if failed_layers else "All layers passed"
+                )
+                verification_feedback = IntegratedVerifier.build_planner_feedback(verification_context)
 
-            repair_result = planner.repair_from_val_errors(
-                beliefs=beliefs,
-                desire=desire,
-                previous_plan_actions=plan_actions,
-                val_errors=clean_errors,
-                repair_history=cumulative_history,
-                verification_feedback=verification_feedback,
-                instance_id=instance_id,
-                domain=domain,
-                domain_context=runtime.get("domain_context") or "",
-                allow_early_exit=False,
-            )
-            current_plan = repair_result.plan
-            plan_actions = _plan_to_pddl_actions(current_plan, domain, runtime)
-            val_valid, val_errors = verifier.verify_plan(
-                domain_file=pddl_domain_path,
-                problem_file=pddl_problem_path,
-                plan_actions=plan_actions,
-                verbose=True,
-            )
+                repair_result = planner.repair_from_val_errors(
+                    beliefs=beliefs,
+                    desire=desire,
+                    previous_plan_actions=plan_actions,
+                    val_errors=clean_errors,
+                    repair_history=cumulative_history,
+                    verification_feedback=verification_feedback,
+                    instance_id=instance_id,
+                    domain=domain,
+                    domain_context=runtime.get("domain_context") or "",
+                    allow_early_exit=False,
+                )
+                current_plan = repair_result.plan
+                plan_actions = _plan_to_pddl_actions(current_plan, domain, runtime)
+                val_valid, val_errors = verifier.verify_plan(
+                    domain_file=pddl_domain_path,
+                    problem_file=pddl_problem_path,
+                    plan_actions=plan_actions,
+                    verbose=True,
+                )
 
-            graph = current_plan.to_networkx()
-            struct_result = PlanVerifier.verify(graph)
-            result["verification_layers"]["structural"] = {
-                "valid": struct_result.is_valid,
-                "errors": struct_result.errors,
-                "hard_errors": struct_result.hard_errors,
-                "warnings": struct_result.warnings,
-            }
-            result["verification_layers"]["symbolic"] = {"valid": val_valid, "errors": val_errors}
-            result["plan_actions"] = plan_actions
-            result["pddl_actions"] = plan_actions
-            result["plan_nodes"] = _serialize_plan_nodes(current_plan)
-            result["symbolic_valid"] = bool(val_valid)
-            result["success"] = bool(val_valid)
-
-            if val_valid:
-                result["val_repair"]["success"] = True
-                result["val_repair"]["history"][-1]["repaired"] = True
-                break
+                graph = current_plan.to_networkx()
+                struct_result = PlanVerifier.verify(graph)
+                result["verification_layers"]["structural"] = {
+                    "valid": struct_result.is_valid,
+                    "errors": struct_result.errors,
+                    "hard_errors": struct_result.hard_errors,
+                    "warnings": struct_result.warnings,
+                }
+                result["verification_layers"]["symbolic"] = {"valid": val_valid, "errors": val_errors}
+                result["plan_actions"] = plan_actions
+                result["pddl_actions"] = plan_actions
+                result["plan_nodes"] = _serialize_plan_nodes(current_plan)
+                result["symbolic_valid"] = bool(val_valid)
+                result["success"] = bool(val_valid)
+
+                if val_valid:
+                    result["val_repair"]["success"] = True
+                    result["val_repair"]["history"][-1]["repaired"] = True
+                    break
 
     return result
 
@@ -1574,17 +1640,13 @@ def bdi_to_pddl_actions(
     """
     pddl_actions = []
 
-    # Get topological order of actions
+    # Get topological order of actions (virtual nodes filtered out)
     G = plan.to_networkx()
-
-    # Filter out virtual nodes
     virtual_nodes = {"__START__", "__END__"}
 
     try:
-        import networkx as nx
-
         ordered_nodes = [n for n in nx.topological_sort(G) if n not in virtual_nodes]
-    except:
+    except nx.NetworkXUnfeasible:
         # If cycles, use node order as-is
         ordered_nodes = [node.id for node in plan.nodes if node.id not in virtual_nodes]
 
@@ -1687,6 +1749,22 @@ def bdi_to_pddl_actions(
                 return _normalise_param(value)
         return ""
 
+    def _positional_fallback(params: dict):
+        """Return a ``k -> normalised k-th param value`` accessor.
+
+        ``params.values()`` is only materialised on the first positional
+        lookup, i.e. when the LLM did not use the canonical key names.
+        """
+        values: list | None = None
+
+        def _param_at(k: int) -> str:
+            nonlocal values
+            if values is None:
+                values = list(params.values())
+            return _normalise_param(values[k]) if k < len(values) else ""
+
+        return _param_at
+
     # Convert each action to PDDL format using params deterministically
     for node_id in ordered_nodes:
         action_node = node_lookup.get(node_id)
@@ -1742,15 +1820,15 @@ def bdi_to_pddl_actions(
             )
 
             # Fallback: use positional parameters if named parameters fail
-            param_values = list(params.values())
+            param_at = _positional_fallback(params)
 
             if canon == "load-truck":
-                if not obj and len(param_values) >= 1:
-                    obj = _normalise_param(param_values[0])
-                if not truck and len(param_values) >= 2:
-                    truck = _normalise_param(param_values[1])
-                if not loc and len(param_values) >= 3:
-                    loc = _normalise_param(param_values[2])
+                if not obj:
+                    obj = param_at(0)
+                if not truck:
+                    truck = param_at(1)
+                if not loc:
+                    loc = param_at(2)
 
                 if obj and truck and loc:
                     pddl_actions.append(f"(LOAD-TRUCK {obj} {truck} {loc})")
@@ -1760,12 +1838,12 @@ def bdi_to_pddl_actions(
                     )
 
             elif canon == "load-airplane":
-                if not obj and len(param_values) >= 1:
-                    obj = _normalise_param(param_values[0])
-                if not airplane and len(param_values) >= 2:
-                    airplane = _normalise_param(param_values[1])
-                if not loc and len(param_values) >= 3:
-                    loc = _normalise_param(param_values[2])
+                if not obj:
+                    obj = param_at(0)
+                if not airplane:
+                    airplane = param_at(1)
+                if not loc:
+                    loc = param_at(2)
 
                 if obj and airplane and loc:
                     pddl_actions.append(f"(LOAD-AIRPLANE {obj} {airplane} {loc})")
@@ -1775,12 +1853,12 @@ def bdi_to_pddl_actions(
                     )
 
             elif canon == "unload-truck":
-                if not obj and len(param_values) >= 1:
-                    obj = _normalise_param(param_values[0])
-                if not truck and len(param_values) >= 2:
-                    truck = _normalise_param(param_values[1])
-                if not loc and len(param_values) >= 3:
-                    loc = _normalise_param(param_values[2])
+                if not obj:
+                    obj = param_at(0)
+                if not truck:
+                    truck = param_at(1)
+                if not loc:
+                    loc = param_at(2)
 
                 if obj and truck and loc:
                     pddl_actions.append(f"(UNLOAD-TRUCK {obj} {truck} {loc})")
@@ -1790,12 +1868,12 @@ def bdi_to_pddl_actions(
                     )
 
             elif canon == "unload-airplane":
-                if not obj and len(param_values) >= 1:
-                    obj = _normalise_param(param_values[0])
-                if not airplane and len(param_values) >= 2:
-                    airplane = _normalise_param(param_values[1])
-                if not loc and len(param_values) >= 3:
-                    loc = _normalise_param(param_values[2])
+                if not obj:
+                    obj = param_at(0)
+                if not airplane:
+                    airplane = param_at(1)
+                if not loc:
+                    loc = param_at(2)
 
                 if obj and airplane and loc:
                     pddl_actions.append(f"(UNLOAD-AIRPLANE {obj} {airplane} {loc})")
@@ -1805,14 +1883,14 @@ def bdi_to_pddl_actions(
                     )
 
             elif canon == "drive-truck":
-                if not truck and len(param_values) >= 1:
-                    truck = _normalise_param(param_values[0])
-                if not loc_from and len(param_values) >= 2:
-                    loc_from = _normalise_param(param_values[1])
-                if not loc_to and len(param_values) >= 3:
-                    loc_to = _normalise_param(param_values[2])
-                if not city and len(param_values) >= 4:
-                    city = _normalise_param(param_values[3])
+                if not truck:
+                    truck = param_at(0)
+                if not loc_from:
+                    loc_from = param_at(1)
+                if not loc_to:
+                    loc_to = param_at(2)
+                if not city:
+                    city = param_at(3)
 
                 if truck and loc_from and loc_to and city:
                     pddl_actions.append(f"(DRIVE-TRUCK {truck} {loc_from} {loc_to} {city})")
@@ -1822,12 +1900,12 @@ def bdi_to_pddl_actions(
                     )
 
             elif canon == "fly-airplane":
-                if not airplane and len(param_values) >= 1:
-                    airplane = _normalise_param(param_values[0])
-                if not loc_from and len(param_values) >= 2:
-                    loc_from = _normalise_param(param_values[1])
-                if not loc_to and len(param_values) >= 3:
-                    loc_to = _normalise_param(param_values[2])
+                if not airplane:
+                    airplane = param_at(0)
+                if not loc_from:
+                    loc_from = param_at(1)
+                if not loc_to:
+                    loc_to = param_at(2)
 
                 if airplane and loc_from and loc_to:
                     pddl_actions.append(f"(FLY-AIRPLANE {airplane} {loc_from} {loc_to})")
@@ -1940,18 +2018,18 @@ def bdi_to_pddl_actions(
                 ],
             )
 
-            # Positional fallback using param_values
-            param_values = list(params.values())
+            # Positional fallback (values listed only if a named lookup missed)
+            param_at = _positional_fallback(params)
             description = action_node.description.lower() if getattr(action_node, "description", None) else ""
 
             if canon == "drive":
                 # Drive(?x - truck ?y - place ?z - place)
-                if not truck and len(param_values) >= 1:
-                    truck = _normalise_param(param_values[0])
-                if not loc_from and len(param_values) >= 2:
-                    loc_from = _normalise_param(param_values[1])
-                if not loc_to and len(param_values) >= 3:
-                    loc_to = _normalise_param(param_values[2])
+                if not truck:
+                    truck = param_at(0)
+                if not loc_from:
+                    loc_from = param_at(1)
+                if not loc_to:
+                    loc_to = param_at(2)
 
                 truck = _resolve_object(truck, {"truck"}, description)
                 loc_from = _resolve_object(loc_from, {"depot", "distributor", "place"}, description)
@@ -1966,14 +2044,14 @@ def bdi_to_pddl_actions(
 
             elif canon == "lift":
                 # Lift(?x - hoist ?y - crate ?z - surface ?p - place)
-                if not hoist and len(param_values) >= 1:
-                    hoist = _normalise_param(param_values[0])
-                if not crate and len(param_values) >= 2:
-                    crate = _normalise_param(param_values[1])
-                if not surface and len(param_values) >= 3:
-                    surface = _normalise_param(param_values[2])
-                if not loc and len(param_values) >= 4:
-                    loc = _normalise_param(param_values[3])
+                if not hoist:
+                    hoist = param_at(0)
+                if not crate:
+                    crate = param_at(1)
+                if not surface:
+                    surface = param_at(2)
+                if not loc:
+                    loc = param_at(3)
 
                 hoist = _resolve_object(hoist, {"hoist"}, description)
                 crate = _resolve_object(crate, {"crate"}, description)
@@ -1989,14 +2067,14 @@ def bdi_to_pddl_actions(
 
             elif canon == "drop":
                 # Drop(?x - hoist ?y - crate ?z - surface ?p - place)
-                if not hoist and len(param_values) >= 1:
-                    hoist = _normalise_param(param_values[0])
-                if not crate and len(param_values) >= 2:
-                    crate = _normalise_param(param_values[1])
-                if not surface and len(param_values) >= 3:
-                    surface = _normalise_param(param_values[2])
-                if not loc and len(param_values) >= 4:
-                    loc = _normalise_param(param_values[3])
+                if not hoist:
+                    hoist = param_at(0)
+                if not crate:
+                    crate = param_at(1)
+                if not surface:
+                    surface = param_at(2)
+                if not loc:
+                    loc = param_at(3)
 
                 hoist = _resolve_object(hoist, {"hoist"}, description)
                 crate = _resolve_object(crate, {"crate"}, description)
@@ -2012,14 +2090,14 @@ def bdi_to_pddl_actions(
 
             elif canon == "load":
                 # Load(?x - hoist ?y - crate ?z - truck ?p - place)
-                if not hoist and len(param_values) >= 1:
-                    hoist = _normalise_param(param_values[0])
-                if not crate and len(param_values) >= 2:
-                    crate = _normalise_param(param_values[1])
-                if not truck and len(param_values) >= 3:
-                    truck = _normalise_param(param_values[2])
-                if not loc and len(param_values) >= 4:
-                    loc = _normalise_param(param_values[3])
+                if not hoist:
+                    hoist = param_at(0)
+                if not crate:
+                    crate = param_at(1)
+                if not truck:
+                    truck = param_at(2)
+                if not loc:
+                    loc = param_at(3)
 
                 hoist = _resolve_object(hoist, {"hoist"}, description)
                 crate = _resolve_object(crate, {"crate"}, description)
@@ -2035,14 +2113,14 @@ def bdi_to_pddl_actions(
 
             elif canon == "unload":
                 # Unload(?x - hoist ?y - crate ?z - truck ?p - place)
-                if not hoist and len(param_values) >= 1:
-                    hoist = _normalise_param(param_values[0])
-                if not crate and len(param_values) >= 2:
-                    crate = _normalise_param(param_values[1])
-                if not truck and len(param_values) >= 3:
-                    truck = _normalise_param(param_values[2])
-                if not loc and len(param_values) >= 4:
-                    loc = _normalise_param(param_values[3])
+                if not hoist:
+                    hoist = param_at(0)
+                if not crate:
+                    crate = param_at(1)
+                if not truck:
+                    truck = param_at(2)
+                if not loc:
+                    loc = param_at(3)
 
                 hoist = _resolve_object(hoist, {"hoist"}, description)
                 crate = _resolve_object(crate, {"crate"}, description)
@@ -2093,13 +2171,14 @@ def generate_bdi_plan(
 
     Returns:
         (plan, is_valid, metrics)
-    """
-    from bdi_llm.symbolic_verifier import (
-        BlocksworldPhysicsValidator,
-        IntegratedVerifier,
-        PDDLSymbolicVerifier,
-    )
 
+    Thread safety:
+        The function keeps no module-level mutable state: planners, verifiers
+        and metrics are created per call and progress is reported through
+        ``logger``, so it can be fanned out across a ``ThreadPoolExecutor``
+        (LLM calls are I/O-bound) the same way ``run_batch_evaluation`` fans
+        out ``evaluate_single_instance``.
+    """
     start_time = time.time()
     resolved_mode = resolve_execution_mode(execution_mode)
     mode_flags = execution_mode_flags(resolved_mode)
@@ -2143,13 +2222,8 @@ def generate_bdi_plan(
             if generic_domain:
                 if not pddl_domain_path:
                     raise ValueError("Generic PDDL planning requires pddl_domain_path for action schema extraction.")
-                domain_text = Path(pddl_domain_path).read_text()
-                domain_spec = DomainSpec.from_pddl(domain, domain_text)
-                param_order_map = {
-                    action["name"]: [param_name for param_name, _ptype in action["parameters"]]
-                    for action in extract_actions_from_pddl(domain_text)
-                }
-                generic_serializer = PDDLPlanSerializer(param_order_map=param_order_map)
+                domain_spec, param_order_map = _parse_domain_cached(domain, pddl_domain_path)
+                generic_serializer = PDDLPlanSerializer(param_order_map=dict(param_order_map))
                 generic_task = PlanningTask(
                     task_id=instance_id or Path(pddl_problem_path or "generic").stem,
                     domain_name=domain,
@@ -2199,13 +2273,12 @@ def generate_bdi_plan(
                 metrics["auto_repair"]["triggered"] = True
                 repaired_plan, repaired_valid, messages = repair_and_verify(plan)
                 if repaired_valid:
+                    # repair_and_verify already certified the repaired plan; skip re-verification.
                     plan = repaired_plan
-                    G = plan.to_networkx()
-                    struct_result = PlanVerifier.verify(G)
-                    struct_valid = struct_result.is_valid
-                    struct_errors = struct_result.errors
-                    struct_hard_errors = struct_result.hard_errors
-                    struct_warnings = struct_result.warnings
+                    struct_valid = True
+                    struct_errors = []
+                    struct_hard_errors = []
+                    struct_warnings = []
                     metrics["auto_repair"]["success"] = True
                     metrics["auto_repair"]["repairs_applied"] = messages
 
@@ -2230,7 +2303,7 @@ def generate_bdi_plan(
                 # Set still_try_val to True to let VAL check even structurally failed plans.
                 still_try_val = not struct_valid  # Key fix: try VAL even if structural fails
                 if still_try_val:
-                    print("    Structural verification failed, but still attempting VAL verification")
+                    logger.info("Structural verification failed, but still attempting VAL verification")
             else:
                 still_try_val = False
 
@@ -2245,134 +2318,144 @@ def generate_bdi_plan(
                     pddl_actions = plan_to_pddl_actions(plan)
                     metrics["pddl_actions"] = pddl_actions
 
-                    # Initialize VAL verifier
-                    val_verifier = PDDLSymbolicVerifier()
-                    symbolic_valid, symbolic_errors = val_verifier.verify_plan(
-                        domain_file=pddl_domain_path,
-                        problem_file=pddl_problem_path,
-                        plan_actions=pddl_actions,
-                        verbose=True,
-                    )
-
-                    # VAL error-driven repair loop (with cumulative history)
-                    val_repair_attempt = 0
-                    cumulative_repair_history = []  # Accumulate all previous attempts
-                    while mode_flags["val_repair"] and not symbolic_valid and val_repair_attempt < max_val_repairs:
-                        val_repair_attempt += 1
-                        metrics["val_repair"]["attempts"] = val_repair_attempt
-
-                        # Filter out verbose full VAL output — only keep
-                        # specific error messages and repair advice for the LLM
-                        clean_errors = [
-                            e
-                            for e in symbolic_errors
-                            if not e.lstrip().startswith("Full VAL output:")
-                            and not e.lstrip().startswith("\nFull VAL output:")
-                        ]
-
-                        metrics["val_repair"]["history"].append(
-                            {
-                                "attempt": val_repair_attempt,
-                                "errors": clean_errors[:5],  # Limit stored errors
-                                "repaired": False,
-                            }
-                        )
-
-                        # Record current failed attempt before repair (clean errors only)
-                        cumulative_repair_history.append(
-                            {
-                                "attempt": val_repair_attempt,
-                                "plan_actions": pddl_actions,
-                                "val_errors": clean_errors,
-                            }
-                        )
-
-                        try:
-                            print(
-                                f"    VAL repair attempt {val_repair_attempt}/{max_val_repairs} - errors: {clean_errors[:2]}"
-                            )
-
-                            verification_context = {
-                                "layers": {
-                                    "structural": {
-                                        "valid": struct_valid,
-                                        "errors": struct_errors,
-                                    },
-                                    "symbolic": {
-                                        "valid": symbolic_valid,
-                                        "errors": clean_errors,
-                                    },
-                                },
-                                "overall_valid": struct_valid and symbolic_valid,
-                            }
-                            failed_layers = [
-                                name
-                                for name, layer in verification_context["layers"].items()
-                                if not layer.get("valid", False)
-                            ]
-                            verification_context["error_summary"] = (
-                                f"Failed layers: {', '.join(failed_layers)}" if failed_layers else "All layers passed"
-                            )
-                            verification_feedback = IntegratedVerifier.build_planner_feedback(verification_context)
-
-                            # Call LLM to repair based on VAL errors + full history
-                            repair_result = planner.repair_from_val_errors(
-                                beliefs=beliefs,
-                                desire=desire,
-                                previous_plan_actions=pddl_actions,
-                                val_errors=clean_errors,
-                                repair_history=cumulative_repair_history,
-                                verification_feedback=verification_feedback,
-                                instance_id=instance_id,  # For budget tracking
-                                domain=domain,  # For cache keying
-                                domain_context=domain_context,
-                                allow_early_exit=False,
-                            )
-                            if Config.SAVE_REASONING_TRACE:
-                                repair_trace = planner.get_last_repair_trace()
-                                if repair_trace:
-                                    repair_trace["attempt"] = val_repair_attempt
-                                    metrics["reasoning_trace"]["repairs"].append(repair_trace)
-                            plan = repair_result.plan
-
-                            # Re-verify structure after repair
-                            G = plan.to_networkx()
-                            struct_result_r = PlanVerifier.verify(G)
-                            struct_valid_r = struct_result_r.is_valid
-                            struct_errors_r = struct_result_r.errors
-
-                            # KEY INSIGHT: VAL is the ultimate validator.
-                            # If structural check fails but VAL passes, the plan works.
-                            # Don't break - let VAL verify anyway.
-                            if not struct_valid_r:
-                                print(
-                                    f"    VAL repair {val_repair_attempt}: structural failure after repair, but still trying VAL"
-                                )
-                                struct_valid = struct_valid_r  # Update for outer scope
-                            else:
-                                struct_valid = struct_valid_r  # Update for outer scope
-                            struct_errors = struct_errors_r
-
-                            # Re-convert and re-verify with VAL (even if structural fails)
-                            pddl_actions = plan_to_pddl_actions(plan)
+                    # Initialize VAL verifier (scratch plan file reused across repair attempts)
+                    with PDDLSymbolicVerifier() as val_verifier:
+                        if pddl_actions:
                             symbolic_valid, symbolic_errors = val_verifier.verify_plan(
                                 domain_file=pddl_domain_path,
                                 problem_file=pddl_problem_path,
                                 plan_actions=pddl_actions,
                                 verbose=True,
                             )
+                        else:
+                            # Every node was skipped during conversion; VAL has nothing to check.
+                            symbolic_valid, symbolic_errors = False, [EMPTY_PLAN_ERROR]
+
+                        # VAL error-driven repair loop (with cumulative history)
+                        val_repair_attempt = 0
+                        cumulative_repair_history = []  # Accumulate all previous attempts
+                        while mode_flags["val_repair"] and not symbolic_valid and val_repair_attempt < max_val_repairs:
+                            val_repair_attempt += 1
+                            metrics["val_repair"]["attempts"] = val_repair_attempt
+
+                            # Filter out verbose full VAL output — only keep
+                            # specific error messages and repair advice for the LLM
+                            clean_errors = [
+                                e
+                                for e in symbolic_errors
+                                if not e.lstrip().startswith("Full VAL output:")
+                                and not e.lstrip().startswith("\nFull VAL output:")
+                            ]
+
+                            metrics["val_repair"]["history"].append(
+                                {
+                                    "attempt": val_repair_attempt,
+                                    "errors": clean_errors[:5],  # Limit stored errors
+                                    "repaired": False,
+                                }
+                            )
+
+                            # Record current failed attempt before repair (clean errors only)
+                            cumulative_repair_history.append(
+                                {
+                                    "attempt": val_repair_attempt,
+                                    "plan_actions": pddl_actions,
+                                    "val_errors": clean_errors,
+                                }
+                            )
+
+                            try:
+                                logger.info(
+                                    "VAL repair attempt %d/%d - errors: %s",
+                                    val_repair_attempt,
+                                    max_val_repairs,
+                                    clean_errors[:2],
+                                )
+
+                                verification_context = {
+                                    "layers": {
+                                        "structural": {
+                                            "valid": struct_valid,
+                                            "errors": struct_errors,
+                                        },
+                                        "symbolic": {
+                                            "valid": symbolic_valid,
+                                            "errors": clean_errors,
+                                        },
+                                    },
+                                    "overall_valid": struct_valid and symbolic_valid,
+                                }
+                                failed_layers = [
+                                    name
+                                    for name, layer in verification_context["layers"].items()
+                                    if not layer.get("valid", False)
+                                ]
+                                verification_context["error_summary"] = (
+                                    f"Failed layers: {', '.join(failed_layers)}"
+                                    if failed_layers
+                                    else "All layers passed"
+                                )
+                                verification_feedback = IntegratedVerifier.build_planner_feedback(verification_context)
+
+                                # Call LLM to repair based on VAL errors + full history
+                                repair_result = planner.repair_from_val_errors(
+                                    beliefs=beliefs,
+                                    desire=desire,
+                                    previous_plan_actions=pddl_actions,
+                                    val_errors=clean_errors,
+                                    repair_history=cumulative_repair_history,
+                                    verification_feedback=verification_feedback,
+                                    instance_id=instance_id,  # For budget tracking
+                                    domain=domain,  # For cache keying
+                                    domain_context=domain_context,
+                                    allow_early_exit=False,
+                                )
+                                if Config.SAVE_REASONING_TRACE:
+                                    repair_trace = planner.get_last_repair_trace()
+                                    if repair_trace:
+                                        repair_trace["attempt"] = val_repair_attempt
+                                        metrics["reasoning_trace"]["repairs"].append(repair_trace)
+                                plan = repair_result.plan
+
+                                # Re-verify structure after repair
+                                G = plan.to_networkx()
+                                struct_result_r = PlanVerifier.verify(G)
+                                struct_valid_r = struct_result_r.is_valid
+                                struct_errors_r = struct_result_r.errors
+
+                                # KEY INSIGHT: VAL is the ultimate validator.
+                                # If structural check fails but VAL passes, the plan works.
+                                # Don't break - let VAL verify anyway.
+                                if not struct_valid_r:
+                                    logger.info(
+                                        "VAL repair %d: structural failure after repair, but still trying VAL",
+                                        val_repair_attempt,
+                                    )
+                                    struct_valid = struct_valid_r  # Update for outer scope
+                                else:
+                                    struct_valid = struct_valid_r  # Update for outer scope
+                                struct_errors = struct_errors_r
+
+                                # Re-convert and re-verify with VAL (even if structural fails)
+                                pddl_actions = plan_to_pddl_actions(plan)
+                                symbolic_valid, symbolic_errors = val_verifier.verify_plan(
+                                    domain_file=pddl_domain_path,
+                                    problem_file=pddl_problem_path,
+                                    plan_actions=pddl_actions,
+                                    verbose=True,
+                                )
 
-                            if symbolic_valid:
-                                metrics["val_repair"]["success"] = True
-                                metrics["val_repair"]["history"][-1]["repaired"] = True
-                                # Update structural metrics with repaired plan
-                                metrics["num_nodes"] = len(plan.nodes)
-                                metrics["num_edges"] = len(plan.edges)
-                                print(f"    VAL repair {val_repair_attempt}: SUCCESS")
+                                if symbolic_valid:
+                                    metrics["val_repair"]["success"] = True
+                                    metrics["val_repair"]["history"][-1]["repaired"] = True
+                                    # Update structural metrics with repaired plan
+                                    metrics["num_nodes"] = len(plan.nodes)
+                                    metrics["num_edges"] = len(plan.edges)
+                                    logger.info("VAL repair %d: SUCCESS", val_repair_attempt)
 
-                        except Exception as repair_err:
-                            print(f"    VAL repair {val_repair_attempt} failed: {str(repair_err)[:100]}")
-                            continue
+                            except Exception as repair_err:
+                                logger.warning("VAL repair %d failed: %s", val_repair_attempt, str(repair_err)[:100])
+                                continue
 
                 except Exception as e:
                     symbolic_valid = False
@@ -2416,13 +2499,16 @@ def generate_bdi_plan(
             if mode_flags["symbolic_check"] and symbolic_valid and pddl_problem_path and pddl_domain_path:
                 # VAL passed = plan works (regardless of structural status)
                 overall_valid = True
-                print(f"    Overall: VALID (VAL passed, structural={struct_valid}, physics={physics_valid})")
+                logger.info("Overall: VALID (VAL passed, structural=%s, physics=%s)", struct_valid, physics_valid)
             else:
                 # No VAL verification available - fall back to local layers only.
                 overall_valid = struct_valid and (physics_valid if mode_flags["physics_check"] else True)
-                print(
-                    f"    Overall: {'VALID' if overall_valid else 'INVALID'} "
-                    f"(mode={resolved_mode}, structural={struct_valid}, physics={physics_valid})"
+                logger.info(
+                    "Overall: %s (mode=%s, structural=%s, physics=%s)",
+                    "VALID" if overall_valid else "INVALID",
+                    resolved_mode,
+                    struct_valid,
+                    physics_valid,
                 )
 
             metrics["overall_valid"] = overall_valid
@@ -2436,21 +2522,11 @@ def generate_bdi_plan(
 
             # Check if it's a retryable error (connection issues, rate limits)
             error_str = str(e).lower()
-            if (
-                "connection" in error_str
-                or "timeout" in error_str
-                or "internal" in error_str
-                or "resourceexhausted" in error_str
-                or "429" in error_str
-                or "rate" in error_str
-                or "quota" in error_str
-            ):
+            if any(marker in error_str for marker in _RETRYABLE_MARKERS):
                 if attempt < max_retries - 1:
-                    import time as time_module
-
-                    wait_time = 2 ** (attempt + 1)  # Exponential backoff
-                    print(f"    API error, retrying in {wait_time}s... ({attempt + 1}/{max_retries})")
-                    time_module.sleep(wait_time)
+                    wait_time = _BACKOFFS[min(attempt, len(_BACKOFFS) - 1)] + random.random()
+                    logger.warning("API error, retrying in %.1fs... (%d/%d)", wait_time, attempt + 1, max_retries)
+                    time.sleep(wait_time)
                     continue
 
             # Non-retryable error or max retries reached
@@ -2482,32 +2558,262 @@ def generate_bdi_plan(
 
 
 def find_all_instances(base_path: str, domain: str) -> list[str]:
-    """Find all PDDL instance files for a domain"""
-    domain_path = Path(base_path) / "instances" / domain
+    """Find all PDDL instance files for a domain.
+
+    Scans ``generated/``, ``generated_basic/`` and ``generated_basic_*/`` under
+    ``instances/<domain>`` in a single directory walk.
+    """
+    domain_path = str(Path(base_path) / "instances" / domain)
 
     instance_files = []
-    for pattern in [
-        "generated/instance-*.pddl",
-        "generated_basic/instance-*.pddl",
-        "generated_basic_*/instance-*.pddl",
-    ]:
-        instance_files.extend(domain_path.glob(pattern))
+    try:
+        with os.scandir(domain_path) as entries:
+            subdirs = [
+                entry.path
+                for entry in entries
+                if entry.is_dir()
+                and (entry.name in ("generated", "generated_basic") or entry.name.startswith("generated_basic_"))
+            ]
+    except FileNotFoundError:
+        return []
+
+    for subdir in subdirs:
+        with os.scandir(subdir) as entries:
+            instance_files.extend(
+                entry.path for entry in entries if entry.name.startswith("instance-") and entry.name.endswith(".pddl")
+            )
+
+    return sorted(instance_files)
+
+
+def iter_checkpoint_records(checkpoint_file: str):
+    """Stream per-instance results from a checkpoint.
+
+    JSONL checkpoints are read line by line; a torn trailing line from an
+    interrupted write is skipped. Legacy ``.json`` checkpoints (a full
+    ``{"results": [...]}`` snapshot) are still accepted for ``--resume``.
+    """
+    if not checkpoint_file.endswith(".jsonl"):
+        with open(checkpoint_file) as f:
+            yield from json.load(f).get("results", [])
+        return
+
+    with open(checkpoint_file) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping truncated checkpoint line in %s", checkpoint_file)
+
+
+def open_checkpoint_for_append(checkpoint_file: str):
+    """Open an existing JSONL checkpoint for appending, repairing an unterminated last line.
+
+    A torn final write (skipped by ``iter_checkpoint_records``) is truncated so
+    the next record is not glued onto it; a complete record that only lacks its
+    newline is kept and terminated, since resume already counted it as done.
+    """
+    checkpoint_fh = open(checkpoint_file, "r+b", buffering=1 << 20)
+    end = pos = checkpoint_fh.seek(0, os.SEEK_END)
+    while pos > 0:
+        start = max(0, pos - (1 << 16))
+        checkpoint_fh.seek(start)
+        newline = checkpoint_fh.read(pos - start).rfind(b"\n")
+        if newline != -1:
+            pos = start + newline + 1
+            break
+        pos = start
+    if pos != end:
+        checkpoint_fh.seek(pos)
+        try:
+            json.loads(checkpoint_fh.read(end - pos))
+        except ValueError:
+            logger.warning("Dropping %d bytes of truncated checkpoint line in %s", end - pos, checkpoint_file)
+            checkpoint_fh.truncate(pos)
+            checkpoint_fh.seek(pos)
+        else:
+            checkpoint_fh.write(b"\n")
+    return checkpoint_fh
+
+
+def append_checkpoint_record(checkpoint_fh, record: dict) -> None:
+    """Append one compact instance result to an open (binary) JSONL checkpoint."""
+    if orjson is not None:
+        checkpoint_fh.write(orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE))
+    else:
+        checkpoint_fh.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+
+
+def save_checkpoint_summary(checkpoint_file: str, results: dict, success_count: int, failed_count: int) -> None:
+    """Write the small progress sidecar next to the JSONL checkpoint."""
+    write_json_atomic(
+        f"{checkpoint_file}.summary.json",
+        {
+            "domain": results["domain"],
+            "execution_mode": results["execution_mode"],
+            "total_instances": results["total_instances"],
+            "completed": len(results["results"]),
+            "success_count": success_count,
+            "failed_count": failed_count,
+            "updated_at": datetime.now().isoformat(),
+        },
+    )
+
+
+@functools.cache
+def _planner_source_version() -> str:
+    """Hash the planner package (signatures, prompts, verifiers) and this runner."""
+    digest = hashlib.sha1()
+    sources = sorted((PROJECT_ROOT / "src" / "bdi_llm").rglob("*.py")) + [Path(__file__).resolve()]
+    for path in sources:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _generation_fingerprint() -> list:
+    """LLM generation settings and planner version that a cached result depends on.
+
+    Read at call time: ``apply_runtime_controls`` may still change them (e.g.
+    ``--deterministic`` forces temperature 0).
+    """
+    return [
+        Config.MODEL_NAME,
+        Config.TEMPERATURE,
+        Config.MAX_TOKENS,
+        sorted(Config.DOMAIN_MAX_TOKENS.items()),
+        Config.REASONING_EFFORT,
+        Config.ENABLE_THINKING,
+        Config.SEED,
+        Config.COMPRESS_PROMPTS,
+        _planner_source_version(),
+    ]
+
+
+def _plan_cache_key(domain: str, execution_mode: str, beliefs: str, desire: str, domain_file: str) -> str:
+    """Content-address a pipeline run by its prompt inputs, generation config and domain file version."""
+    try:
+        domain_mtime = os.path.getmtime(domain_file)
+    except OSError:
+        domain_mtime = None
+    payload = json.dumps(
+        [domain, execution_mode, beliefs, desire, domain_file, domain_mtime, _generation_fingerprint()]
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-    return sorted([str(f) for f in instance_files])
 
+def _has_transient_error(pipeline_results: dict) -> bool:
+    """True if any stage failed for an environmental reason (VAL timeout/exec error, API failure)."""
+    for stage in pipeline_results.values():
+        if not isinstance(stage, dict):
+            continue
+        messages = [stage.get("error") or ""]
+        for layer in (stage.get("verification_layers") or {}).values():
+            if isinstance(layer, dict):
+                messages += layer.get("errors") or []
+                messages += layer.get("hard_errors") or []
+        if any(marker in str(message).lower() for message in messages for marker in _TRANSIENT_ERROR_MARKERS):
+            return True
+    return False
+
+
+def _plan_cache_get(cache_dir: str, key: str) -> dict | None:
+    """Return cached pipeline results for ``key``, or None on miss/corruption."""
+    try:
+        with open(Path(cache_dir) / f"{key}.json") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _plan_cache_put(cache_dir: str, key: str, pipeline_results: dict) -> None:
+    """Persist pipeline results atomically; cache write failures are non-fatal."""
+    try:
+        write_json_atomic(Path(cache_dir) / f"{key}.json", pipeline_results)
+    except OSError as e:
+        logger.warning("Plan cache write failed for %s: %s", key, e)
+
+
+def _instance_domain_file(instance_file: str) -> str | None:
+    """Resolve the PDDL domain file an instance is validated against (None if unreadable)."""
+    try:
+        with open(instance_file) as f:
+            domain_match = re.search(r"\(:domain\s+(.*?)\)", f.read())
+    except OSError:
+        return None
+    return resolve_domain_file(domain_match.group(1).strip() if domain_match else "blocksworld")
 
-def save_checkpoint_atomic(results: dict, checkpoint_file: str) -> None:
-    """Persist checkpoint atomically to reduce corruption risk on interruption."""
-    write_json_atomic(checkpoint_file, results)
 
+def _result_store_key(domain: str, execution_mode: str, instance_file: str) -> str:
+    """Identify a completed instance result across runs.
 
-def evaluate_single_instance(instance_file: str, domain: str, execution_mode: str | None = None) -> dict:
+    Covers the instance and domain file versions plus the generation config and
+    planner version, so edits to any of them rerun the instance.
+    """
+    domain_file = _instance_domain_file(instance_file)
+    mtimes = []
+    for path in (instance_file, domain_file):
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except (OSError, TypeError):
+            mtimes.append(None)
+    payload = json.dumps(
+        [domain, execution_mode, os.path.abspath(instance_file), domain_file, mtimes, _generation_fingerprint()]
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def open_result_store(output_dir: str) -> sqlite3.Connection:
+    """Open (creating if needed) the cross-run store of completed instance results."""
+    conn = sqlite3.connect(os.path.join(output_dir, "results.db"))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS done (key TEXT PRIMARY KEY, instance_file TEXT NOT NULL, result_json TEXT NOT NULL)"
+    )
+    return conn
+
+
+def load_stored_result(conn: sqlite3.Connection, domain: str, execution_mode: str, instance_file: str) -> dict | None:
+    """Return a prior run's result for ``instance_file``, or None if absent."""
+    row = conn.execute(
+        "SELECT result_json FROM done WHERE key = ?",
+        (_result_store_key(domain, execution_mode, instance_file),),
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def store_completed_result(
+    conn: sqlite3.Connection | None, domain: str, execution_mode: str, result_key: str, instance_result: dict
+) -> None:
+    """Record an instance whose selected stage completed (errors are not stored, so they rerun)."""
+    if conn is None or instance_result.get(result_key) is None:
+        return
+    instance_file = instance_result["instance_file"]
+    conn.execute(
+        "INSERT OR REPLACE INTO done (key, instance_file, result_json) VALUES (?, ?, ?)",
+        (_result_store_key(domain, execution_mode, instance_file), instance_file, json.dumps(instance_result)),
+    )
+    conn.commit()
+
+
+def evaluate_single_instance(
+    instance_file: str,
+    domain: str,
+    execution_mode: str | None = None,
+    plan_cache_dir: str | None = None,
+) -> dict:
     """
     Evaluate a single PDDL instance.
 
     Args:
         instance_file: Path to PDDL problem file
         domain: Domain name (blocksworld, depots, logistics)
+        execution_mode: Pipeline checkpoint to run up to
+        plan_cache_dir: Directory of cached pipeline results keyed by prompt
+            content; identical instances skip the LLM and VAL repair (None disables)
 
     Returns:
         Dictionary with evaluation results
@@ -2515,7 +2821,7 @@ def evaluate_single_instance(instance_file: str, domain: str, execution_mode: st
     instance_result = {
         "instance_file": instance_file,
         "instance_name": Path(instance_file).stem,
-        "timestamp": datetime.now().isoformat(),
+        "ts": time.time(),  # formatted to ISO "timestamp" once, when results are finalised
         "execution_mode": resolve_execution_mode(execution_mode),
     }
 
@@ -2541,18 +2847,28 @@ def evaluate_single_instance(instance_file: str, domain: str, execution_mode: st
         domain_name = pddl_data.get("domain_name", "blocksworld")
         domain_file = resolve_domain_file(domain_name)
 
-        pipeline_results = run_planbench_pipeline_for_instance(
-            beliefs=beliefs,
-            desire=desire,
-            domain=domain,
-            pddl_problem_path=instance_file,
-            pddl_domain_path=domain_file,
-            init_state=init_state,
-            objects=pddl_data.get("objects", []),
-            typed_objects=pddl_data.get("typed_objects", {}),
-            execution_mode=instance_result["execution_mode"],
-            instance_id=instance_file,  # Use instance file path as unique ID
-        )
+        cache_key = None
+        pipeline_results = None
+        if plan_cache_dir:
+            cache_key = _plan_cache_key(domain, instance_result["execution_mode"], beliefs, desire, domain_file)
+            pipeline_results = _plan_cache_get(plan_cache_dir, cache_key)
+            instance_result["plan_cache_hit"] = pipeline_results is not None
+
+        if pipeline_results is None:
+            pipeline_results = run_planbench_pipeline_for_instance(
+                beliefs=beliefs,
+                desire=desire,
+                domain=domain,
+                pddl_problem_path=instance_file,
+                pddl_domain_path=domain_file,
+                init_state=init_state,
+                objects=pddl_data.get("objects", []),
+                typed_objects=pddl_data.get("typed_objects", {}),
+                execution_mode=instance_result["execution_mode"],
+                instance_id=instance_file,  # Use instance file path as unique ID
+            )
+            if cache_key and not _has_transient_error(pipeline_results):
+                _plan_cache_put(plan_cache_dir, cache_key, pipeline_results)
 
         instance_result.update(pipeline_results)
         selected_key = stage_result_key(instance_result["execution_mode"])
@@ -2567,6 +2883,103 @@ def evaluate_single_instance(instance_file: str, domain: str, execution_mode: st
     return instance_result
 
 
+EMPTY_BATCH_SUMMARY = {
+    "total_evaluated": 0,
+    "stage": None,
+    "success_count": 0,
+    "failed_count": 0,
+    "success_rate": 0,
+    "baseline": {"attempted": 0, "success_count": 0, "success_rate": 0},
+    "bdi": {"attempted": 0, "success_count": 0, "success_rate": 0},
+    "bdi_repair": {"attempted": 0, "success_count": 0, "success_rate": 0},
+    "repair_contribution": {"successful_repairs": 0},
+    "val_repair": {"triggered": 0, "successful": 0, "total_attempts": 0, "success_rate": 0},
+}
+
+
+def compute_batch_summary(rows: list[dict], stage: str) -> dict:
+    """Aggregate per-stage and VAL-repair statistics over instance results."""
+    if not rows:
+        summary = copy.deepcopy(EMPTY_BATCH_SUMMARY)
+        summary["stage"] = stage
+        return summary
+
+    # Single pass over the results: per-stage attempt/success counts plus
+    # repair-contribution and VAL-repair aggregates.
+    stage_keys = ("baseline_result", "bdi_initial_result", "bdi_repair_result")
+    attempted_counts = dict.fromkeys(stage_keys, 0)
+    success_counts = dict.fromkeys(stage_keys, 0)
+    repair_contribution = 0
+    val_repair_triggered = 0
+    val_repair_success = 0
+    val_repair_total_attempts = 0
+    for r in rows:
+        # Resolve each stage dict once per row; everything below reads these aliases.
+        stages = [r.get(key) for key in stage_keys]
+        for key, stage_result in zip(stage_keys, stages, strict=True):
+            if stage_result is not None:
+                attempted_counts[key] += 1
+                if stage_result.get("success", False):
+                    success_counts[key] += 1
+
+        _baseline, initial, repaired = stages
+        if (
+            initial is not None
+            and repaired is not None
+            and not initial.get("success", False)
+            and repaired.get("success", False)
+        ):
+            repair_contribution += 1
+
+        val_repair = repaired.get("val_repair") if repaired is not None else None
+        if val_repair:
+            attempts = val_repair.get("attempts", 0)
+            val_repair_total_attempts += attempts
+            if attempts > 0:
+                val_repair_triggered += 1
+            if val_repair.get("success", False):
+                val_repair_success += 1
+
+    def _checkpoint_stats(result_key: str) -> dict:
+        attempted = attempted_counts[result_key]
+        success = success_counts[result_key]
+        return {
+            "attempted": attempted,
+            "success_count": success,
+            "success_rate": success / attempted if attempted else 0,
+        }
+
+    baseline_stats = _checkpoint_stats("baseline_result")
+    bdi_stats = _checkpoint_stats("bdi_initial_result")
+    bdi_repair_stats = _checkpoint_stats("bdi_repair_result")
+
+    selected_stats = {
+        "baseline": baseline_stats,
+        "bdi": bdi_stats,
+        "bdi-repair": bdi_repair_stats,
+    }[stage]
+
+    return {
+        "total_evaluated": len(rows),
+        "stage": stage,
+        "success_count": selected_stats["success_count"],
+        "failed_count": selected_stats["attempted"] - selected_stats["success_count"],
+        "success_rate": selected_stats["success_rate"],
+        "baseline": baseline_stats,
+        "bdi": bdi_stats,
+        "bdi_repair": bdi_repair_stats,
+        "repair_contribution": {
+            "successful_repairs": repair_contribution,
+        },
+        "val_repair": {
+            "triggered": val_repair_triggered,
+            "successful": val_repair_success,
+            "total_attempts": val_repair_total_attempts,
+            "success_rate": val_repair_success / val_repair_triggered if val_repair_triggered > 0 else 0,
+        },
+    }
+
+
 def run_batch_evaluation(
     domain: str,
     max_instances: int = None,
@@ -2577,6 +2990,9 @@ def run_batch_evaluation(
     instances_file: str = None,
     checkpoint_every: int = 1,
     execution_mode: str | None = None,
+    plan_cache: bool = False,
+    reuse_results: bool = False,
+    api_qps: float | None = None,
 ) -> dict:
     """Run evaluation on all instances in a domain with MLflow tracking"""
     global MLFLOW_AVAILABLE
@@ -2589,6 +3005,18 @@ def run_batch_evaluation(
 
     # Setup
     base_path = PLANBENCH_ROOT
+    set_api_qps(api_qps)
+    # Size the in-flight LLM gate to the worker pool so --max_workers is not
+    # silently capped; an explicit API_MAX_CONCURRENCY still bounds it.
+    api_concurrency = max_workers
+    if os.environ.get("API_MAX_CONCURRENCY") and Config.API_MAX_CONCURRENCY < max_workers:
+        logger.warning(
+            "API_MAX_CONCURRENCY=%d caps in-flight LLM requests below max_workers=%d",
+            Config.API_MAX_CONCURRENCY,
+            max_workers,
+        )
+        api_concurrency = Config.API_MAX_CONCURRENCY
+    set_api_concurrency(api_concurrency)
     os.makedirs(output_dir, exist_ok=True)
 
     # Find instances
@@ -2606,6 +3034,7 @@ def run_batch_evaluation(
         print(f"Found {len(instances)} instances")
 
     checkpoint_file = checkpoint_path(output_dir, domain, resolved_mode)
+    plan_cache_dir = os.path.join(output_dir, "plan_cache") if plan_cache else None
     effective_resume = resume_from
     if effective_resume is None and os.path.exists(checkpoint_file):
         effective_resume = checkpoint_file
@@ -2629,15 +3058,22 @@ def run_batch_evaluation(
             mlflow.start_run(run_name=run_name)
             mlflow_run_id = mlflow.active_run().info.run_id
 
-            # Log parameters
-            mlflow.log_param("domain", domain)
-            mlflow.log_param("execution_mode", resolved_mode)
-            mlflow.log_param("max_instances", max_instances if max_instances else "all")
-            mlflow.log_param("total_instances", len(instances))
-            mlflow.log_param("resume_from", effective_resume if effective_resume else "none")
-            mlflow.log_param("checkpoint_every", checkpoint_every)
-            mlflow.log_param("model", "claude-opus-4")
-            mlflow.log_param("auto_repair", True)
+            # Log parameters (one batched request)
+            mlflow.log_params(
+                {
+                    "domain": domain,
+                    "execution_mode": resolved_mode,
+                    "max_instances": max_instances if max_instances else "all",
+                    "total_instances": len(instances),
+                    "resume_from": effective_resume if effective_resume else "none",
+                    "checkpoint_every": checkpoint_every,
+                    "plan_cache": plan_cache,
+                    "reuse_results": reuse_results,
+                    "api_qps": api_qps if api_qps else "unlimited",
+                    "model": "claude-opus-4",
+                    "auto_repair": True,
+                }
+            )
 
             print(f"✓ MLflow tracking enabled (Run ID: {mlflow_run_id})")
         except Exception as e:
@@ -2659,158 +3095,172 @@ def run_batch_evaluation(
 
     if effective_resume and os.path.exists(effective_resume):
         print(f"Resuming from checkpoint: {effective_resume}")
-        with open(effective_resume) as f:
-            checkpoint = json.load(f)
-            results["results"] = checkpoint.get("results", [])
-            completed = {r["instance_file"] for r in results["results"] if r.get(selected_result_key) is not None}
+        results["results"] = list(iter_checkpoint_records(effective_resume))
+        completed = {r["instance_file"] for r in results["results"] if r.get(selected_result_key) is not None}
         print(f"Skipping {len(completed)} completed instances")
 
-    # Evaluate each instance
-    # Initialize counters from resumed results (if any), then accumulate new ones.
-    success_count = sum(1 for r in results["results"] if r.get("success", False))
-    failed_count = len(results["results"]) - success_count
-    results_lock = Lock()  # Thread-safe results collection
-
-    # Filter out completed instances
-    instances_to_process = [inst for inst in instances if inst not in completed]
-
-    if parallel and max_workers > 1:
-        # Parallel execution mode
-        print(f"Running in parallel mode with {max_workers} workers")
-
-        # Rate limiting: limit concurrent API calls to max_workers
-        import threading
-
-        api_semaphore = threading.Semaphore(max_workers)
-
-        def rate_limited_evaluate(instance_file, domain):
-            with api_semaphore:
-                return evaluate_single_instance(instance_file, domain, resolved_mode)
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_instance = {
-                executor.submit(rate_limited_evaluate, instance_file, domain): instance_file
-                for instance_file in instances_to_process
-            }
-
-            # Process completed tasks with progress bar
-            with tqdm(total=len(instances_to_process), desc=f"Evaluating {domain}") as pbar:
-                for future in as_completed(future_to_instance):
-                    try:
-                        instance_result = future.result(timeout=300)  # 5 minute timeout
-                    except TimeoutError:
-                        instance_file = future_to_instance[future]
-                        instance_result = {
-                            "instance_file": instance_file,
-                            "instance_name": Path(instance_file).stem,
-                            "success": False,
-                            "error": "Timeout after 300 seconds",
-                            "bdi_metrics": {
-                                "overall_valid": False,
-                                "verification_layers": {
-                                    "structural": {
-                                        "valid": False,
-                                        "errors": ["Timeout after 300 seconds"],
-                                        "hard_errors": ["Timeout after 300 seconds"],
-                                        "warnings": [],
+    # Append-only checkpoint: one JSON line per finished instance. When resuming
+    # from a different file, seed the new checkpoint with the resumed records.
+    resume_in_place = bool(effective_resume) and os.path.abspath(effective_resume) == os.path.abspath(checkpoint_file)
+    with contextlib.ExitStack() as stack:
+        # Closing on the way out (also on errors) flushes buffered checkpoint records.
+        if resume_in_place:
+            checkpoint_fh = stack.enter_context(open_checkpoint_for_append(checkpoint_file))
+        else:
+            checkpoint_fh = stack.enter_context(open(checkpoint_file, "wb", buffering=1 << 20))
+            for record in results["results"]:
+                append_checkpoint_record(checkpoint_fh, record)
+            checkpoint_fh.flush()
+
+        # Reuse instances already completed by earlier runs into this output_dir
+        result_store = open_result_store(output_dir) if reuse_results else None
+        if result_store is not None:
+            stack.callback(result_store.close)
+            reused = 0
+            for instance_file in instances:
+                if instance_file in completed:
+                    continue
+                stored = load_stored_result(result_store, domain, resolved_mode, instance_file)
+                if stored is None:
+                    continue
+                stored["result_store_hit"] = True
+                results["results"].append(stored)
+                append_checkpoint_record(checkpoint_fh, stored)
+                completed.add(instance_file)
+                reused += 1
+            if reused:
+                checkpoint_fh.flush()
+                print(f"Reusing {reused} instances completed by earlier runs in {output_dir}/results.db")
+
+        # Evaluate each instance
+        # Initialize counters from resumed results (if any), then accumulate new ones.
+        success_count = sum(1 for r in results["results"] if r.get("success", False))
+        failed_count = len(results["results"]) - success_count
+
+        # Filter out completed instances
+        instances_to_process = [inst for inst in instances if inst not in completed]
+
+        if parallel and max_workers > 1:
+            # Parallel execution mode
+            print(f"Running in parallel mode with {max_workers} workers")
+
+            # In-flight LLM requests are gated inside the planner (api_call_slot),
+            # so parsing, VAL and checkpoint I/O run unthrottled across workers.
+            def evaluate_instance(instance_file, domain):
+                return evaluate_single_instance(instance_file, domain, resolved_mode, plan_cache_dir)
+
+            # Parse the shared domain file once before fanning out so workers hit
+            # the cache instead of all parsing the same file concurrently.
+            if instances_to_process:
+                try:
+                    first_domain_name = parse_pddl_problem(instances_to_process[0]).get("domain_name", "blocksworld")
+                    _parse_domain_cached(domain, resolve_domain_file(first_domain_name))
+                except Exception as e:
+                    logger.warning("Domain cache warm-up failed: %s", e)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Stream submissions with back-pressure: keep at most 2x max_workers
+                # futures alive instead of materialising one per instance up front.
+                pending_instances = iter(instances_to_process)
+                max_inflight = max_workers * 2
+                future_to_instance = {}
+
+                def submit_next() -> bool:
+                    instance_file = next(pending_instances, None)
+                    if instance_file is None:
+                        return False
+                    future_to_instance[executor.submit(evaluate_instance, instance_file, domain)] = instance_file
+                    return True
+
+                while len(future_to_instance) < max_inflight and submit_next():
+                    pass
+
+                # Process completed tasks with progress bar
+                with tqdm(total=len(instances_to_process), desc=f"Evaluating {domain}") as pbar:
+                    while future_to_instance:
+                        done, _ = wait(future_to_instance, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            instance_file = future_to_instance.pop(future)
+                            submit_next()
+                            try:
+                                instance_result = future.result(timeout=300)  # 5 minute timeout
+                            except TimeoutError:
+                                instance_result = {
+                                    "instance_file": instance_file,
+                                    "instance_name": Path(instance_file).stem,
+                                    "success": False,
+                                    "error": "Timeout after 300 seconds",
+                                    "bdi_metrics": {
+                                        "overall_valid": False,
+                                        "verification_layers": {
+                                            "structural": {
+                                                "valid": False,
+                                                "errors": ["Timeout after 300 seconds"],
+                                                "hard_errors": ["Timeout after 300 seconds"],
+                                                "warnings": [],
+                                            },
+                                            "symbolic": {"valid": False, "errors": []},
+                                            "physics": {"valid": False, "errors": []},
+                                        },
                                     },
-                                    "symbolic": {"valid": False, "errors": []},
-                                    "physics": {"valid": False, "errors": []},
-                                },
-                            },
-                        }
-
-                    # Thread-safe result collection
-                    with results_lock:
-                        results["results"].append(instance_result)
-
-                        if instance_result.get("success", False):
-                            success_count += 1
-                        else:
-                            failed_count += 1
+                                }
 
-                        # Save checkpoint at configured interval
-                        if len(results["results"]) % checkpoint_every == 0:
-                            save_checkpoint_atomic(results, checkpoint_file)
-
-                    pbar.update(1)
-    else:
-        # Serial execution mode (original behavior)
-        for instance_file in tqdm(instances_to_process, desc=f"Evaluating {domain}"):
-            instance_result = evaluate_single_instance(instance_file, domain, resolved_mode)
+                            # Results are collected on this (consumer) thread only; workers never
+                            # touch `results` or the checkpoint, so no lock is needed here.
+                            results["results"].append(instance_result)
 
-            results["results"].append(instance_result)
-
-            if instance_result.get("success", False):
-                success_count += 1
-            else:
-                failed_count += 1
-
-            # Save checkpoint at configured interval
-            if len(results["results"]) % checkpoint_every == 0:
-                save_checkpoint_atomic(results, checkpoint_file)
-
-    # Always persist latest progress snapshot
-    save_checkpoint_atomic(results, checkpoint_file)
+                            if instance_result.get("success", False):
+                                success_count += 1
+                            else:
+                                failed_count += 1
 
-    def _checkpoint_stats(result_key: str) -> dict:
-        attempted = [r for r in results["results"] if r.get(result_key) is not None]
-        success = sum(1 for r in attempted if r.get(result_key, {}).get("success", False))
-        return {
-            "attempted": len(attempted),
-            "success_count": success,
-            "success_rate": success / len(attempted) if attempted else 0,
-        }
+                            append_checkpoint_record(checkpoint_fh, instance_result)
+                            store_completed_result(
+                                result_store, domain, resolved_mode, selected_result_key, instance_result
+                            )
+                            # Flush checkpoint at configured interval
+                            if len(results["results"]) % checkpoint_every == 0:
+                                checkpoint_fh.flush()
+                                save_checkpoint_summary(checkpoint_file, results, success_count, failed_count)
 
-    baseline_stats = _checkpoint_stats("baseline_result")
-    bdi_stats = _checkpoint_stats("bdi_initial_result")
-    bdi_repair_stats = _checkpoint_stats("bdi_repair_result")
+                            pbar.update(1)
+        else:
+            # Serial execution mode (original behavior)
+            for instance_file in tqdm(instances_to_process, desc=f"Evaluating {domain}"):
+                instance_result = evaluate_single_instance(instance_file, domain, resolved_mode, plan_cache_dir)
 
-    repair_contribution = sum(
-        1
-        for r in results["results"]
-        if r.get("bdi_initial_result") is not None
-        and r.get("bdi_repair_result") is not None
-        and not r.get("bdi_initial_result", {}).get("success", False)
-        and r.get("bdi_repair_result", {}).get("success", False)
-    )
+                results["results"].append(instance_result)
 
-    val_repair_triggered = sum(
-        1 for r in results["results"] if (r.get("bdi_repair_result") or {}).get("val_repair", {}).get("attempts", 0) > 0
-    )
-    val_repair_success = sum(
-        1 for r in results["results"] if (r.get("bdi_repair_result") or {}).get("val_repair", {}).get("success", False)
-    )
-    val_repair_total_attempts = sum(
-        (r.get("bdi_repair_result") or {}).get("val_repair", {}).get("attempts", 0) for r in results["results"]
-    )
+                if instance_result.get("success", False):
+                    success_count += 1
+                else:
+                    failed_count += 1
 
-    selected_stats = {
-        "baseline": baseline_stats,
-        "bdi": bdi_stats,
-        "bdi-repair": bdi_repair_stats,
-    }[resolved_mode]
+                append_checkpoint_record(checkpoint_fh, instance_result)
+                store_completed_result(result_store, domain, resolved_mode, selected_result_key, instance_result)
+                # Flush checkpoint at configured interval
+                if len(results["results"]) % checkpoint_every == 0:
+                    checkpoint_fh.flush()
+                    save_checkpoint_summary(checkpoint_file, results, success_count, failed_count)
 
-    results["summary"] = {
-        "total_evaluated": len(results["results"]),
-        "stage": resolved_mode,
-        "success_count": selected_stats["success_count"],
-        "failed_count": selected_stats["attempted"] - selected_stats["success_count"],
-        "success_rate": selected_stats["success_rate"],
-        "baseline": baseline_stats,
-        "bdi": bdi_stats,
-        "bdi_repair": bdi_repair_stats,
-        "repair_contribution": {
-            "successful_repairs": repair_contribution,
-        },
-        "val_repair": {
-            "triggered": val_repair_triggered,
-            "successful": val_repair_success,
-            "total_attempts": val_repair_total_attempts,
-            "success_rate": val_repair_success / val_repair_triggered if val_repair_triggered > 0 else 0,
-        },
-    }
+    # Always persist latest progress snapshot
+    save_checkpoint_summary(checkpoint_file, results, success_count, failed_count)
+
+    results["summary"] = compute_batch_summary(results["results"], resolved_mode)
+    summary = results["summary"]
+    baseline_stats = summary["baseline"]
+    bdi_stats = summary["bdi"]
+    bdi_repair_stats = summary["bdi_repair"]
+    selected_stats = {"baseline": baseline_stats, "bdi": bdi_stats, "bdi-repair": bdi_repair_stats}[resolved_mode]
+    repair_contribution = summary["repair_contribution"]["successful_repairs"]
+    val_repair_triggered = summary["val_repair"]["triggered"]
+    val_repair_success = summary["val_repair"]["successful"]
+    val_repair_total_attempts = summary["val_repair"]["total_attempts"]
+
+    # Format per-instance timestamps once, off the per-instance hot path
+    for r in results["results"]:
+        if "ts" in r:
+            r["timestamp"] = datetime.fromtimestamp(r.pop("ts")).isoformat()
 
     # Save final results
     output_file = f"{output_dir}/results_{domain}_{resolved_mode}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -2825,19 +3275,22 @@ def run_batch_evaluation(
         try:
             summary = results["summary"]
 
-            # Log aggregate metrics
-            mlflow.log_metric("success_rate", summary["success_rate"])
-            mlflow.log_metric("success_count", summary["success_count"])
-            mlflow.log_metric("failed_count", summary["failed_count"])
-            mlflow.log_metric("baseline_success_rate", summary["baseline"]["success_rate"])
-            mlflow.log_metric("bdi_success_rate", summary["bdi"]["success_rate"])
-            mlflow.log_metric("bdi_repair_success_rate", summary["bdi_repair"]["success_rate"])
-            mlflow.log_metric("repair_contribution", summary["repair_contribution"]["successful_repairs"])
-
-            mlflow.log_metric("val_repair_triggered", summary["val_repair"]["triggered"])
-            mlflow.log_metric("val_repair_successful", summary["val_repair"]["successful"])
-            mlflow.log_metric("val_repair_total_attempts", summary["val_repair"]["total_attempts"])
-            mlflow.log_metric("val_repair_success_rate", summary["val_repair"]["success_rate"])
+            # Log aggregate metrics (one batched request)
+            mlflow.log_metrics(
+                {
+                    "success_rate": summary["success_rate"],
+                    "success_count": summary["success_count"],
+                    "failed_count": summary["failed_count"],
+                    "baseline_success_rate": summary["baseline"]["success_rate"],
+                    "bdi_success_rate": summary["bdi"]["success_rate"],
+                    "bdi_repair_success_rate": summary["bdi_repair"]["success_rate"],
+                    "repair_contribution": summary["repair_contribution"]["successful_repairs"],
+                    "val_repair_triggered": summary["val_repair"]["triggered"],
+                    "val_repair_successful": summary["val_repair"]["successful"],
+                    "val_repair_total_attempts": summary["val_repair"]["total_attempts"],
+                    "val_repair_success_rate": summary["val_repair"]["success_rate"],
+                }
+            )
 
             # Log results file as artifact
             mlflow.log_artifact(output_file)
@@ -2890,6 +3343,12 @@ def run_batch_evaluation(
 def main():
     parser = build_arg_parser()
     args = parser.parse_args()
+    if args.deterministic and (args.plan_cache or args.reuse_results):
+        parser.error("--plan_cache and --reuse_results cannot be combined with --deterministic (caches disabled)")
+
+    # Root stays at WARNING so httpx/LiteLLM/DSPy INFO chatter stays out of batch output.
+    logging.basicConfig(level=logging.WARNING, format="    %(message)s")
+    logger.setLevel(logging.INFO)
 
     # Check API credentials using project config resolution (supports .env + fallback aliases)
     credentials = Config.get_credentials()
@@ -2945,17 +3404,22 @@ def main():
     all_results = {}
     multi_domain = len(domains) > 1
     for domain in domains:
-        results = run_batch_evaluation(
-            domain=domain,
-            max_instances=args.max_instances,
-            resume_from=args.resume,
-            output_dir=args.output_dir,
-            parallel=runtime_config.parallel,
-            max_workers=runtime_config.max_workers,
-            instances_file=args.instances,
-            checkpoint_every=args.checkpoint_every,
-            execution_mode=args.execution_mode,
-        )
+        # Route logger output through tqdm.write so it doesn't break the progress bar
+        with logging_redirect_tqdm():
+            results = run_batch_evaluation(
+                domain=domain,
+                max_instances=args.max_instances,
+                resume_from=args.resume,
+                output_dir=args.output_dir,
+                parallel=runtime_config.parallel,
+                max_workers=runtime_config.max_workers,
+                instances_file=args.instances,
+                checkpoint_every=args.checkpoint_every,
+                execution_mode=args.execution_mode,
+                plan_cache=args.plan_cache,
+                reuse_results=args.reuse_results,
+                api_qps=args.api_qps,
+            )
         all_results[domain] = results
 
         manifest_path = resolve_manifest_path(
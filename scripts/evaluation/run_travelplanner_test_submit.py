@@ -27,9 +27,6 @@ load_dotenv(PROJECT_ROOT / ".env")
 
 from scripts.evaluation._travelplanner_threading import iter_bounded_indexed_results
 from src.bdi_llm.planner.dspy_config import configure_dspy
-
-configure_dspy()
-
 from src.bdi_llm.travelplanner.official import load_travelplanner_split
 from src.bdi_llm.travelplanner.runner import generate_submission
 
@@ -74,6 +71,9 @@ def main():
     parser.add_argument("--workers", type=int, default=100)
     args = parser.parse_args()
 
+    # Configure on the main thread before the worker pool starts generating
+    configure_dspy()
+
     out_dir = Path(args.output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -6,9 +6,17 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import mmap
+import os
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:  # optional: fall back to loading the whole file
+    ijson = None
+
 EXPECTED_FILES = [
     "results_blocksworld_20260212_214230.json",
     "results_logistics_20260213_025757.json",
@@ -31,36 +39,100 @@ EXPECTED_RELATION = {
     "depots_extra": ["instance-183.pddl"],
 }
 
+# Order-free forms of the expected ID lists (duplicates are caught by the failed-count checks)
+_LOGISTICS_FAILED = frozenset(EXPECTED_COUNTS["logistics"][2])
+_DEPOTS_FAILED = frozenset(EXPECTED_COUNTS["depots"][2])
+_DEPOTS_EXTRA = frozenset(EXPECTED_RELATION["depots_extra"])
+
+HASH_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "bdi_llm" / "snapshot_hash_cache.json"
+)
+
+
+MMAP_HASH_LIMIT = 1 << 30  # larger files are streamed rather than mapped whole
+
 
 def sha256(path: Path) -> str:
-    h = hashlib.sha256()
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+        size = os.fstat(f.fileno()).st_size
+        if 0 < size <= MMAP_HASH_LIMIT:  # mmap rejects empty files
+            # One contiguous buffer: OpenSSL hashes the mapped file in a single update
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: read + hash loop runs in C
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        while chunk := f.read(1 << 20):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
+
+
+def load_hash_cache(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hash_cache(path: Path, cache: dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(cache, indent=2, sort_keys=True))
+        tmp.replace(path)
+    except OSError as e:
+        print(f"[WARN] Could not write hash cache {path}: {e}")
+
+
+def cached_sha256(path: Path, cache: dict) -> str:
+    """Reuse a previously computed digest while the file's size and mtime are unchanged.
+
+    MANIFEST.json stays the ground truth; the cache only skips rehashing an
+    unchanged local file. Opt-in (``--hash-cache``): size and mtime can be
+    restored after tampering, so a default run always rehashes.
+    """
+    st = path.stat()
+    key = str(path.resolve())
+    entry = cache.get(key)
+    if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+        return entry["sha256"]
+    digest = sha256(path)
+    cache[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+    return digest
 
 
 def instance_id(row: dict) -> str:
     p = row.get("instance_file") or row.get("instance_name") or ""
-    return p.split("/")[-1]
+    return p.rpartition("/")[2]
 
 
 def load_json(path: Path) -> dict:
     return json.loads(path.read_text())
 
 
+def iter_results(path: Path):
+    """Yield rows of the top-level ``results`` array, streaming when ijson is available."""
+    if ijson is None:
+        yield from load_json(path).get("results", [])
+        return
+    with path.open("rb") as f:
+        yield from ijson.items(f, "results.item")
+
+
 def stats_for(path: Path) -> dict:
-    data = load_json(path)
-    rows = data.get("results", [])
-    passed = [r for r in rows if r.get("success") is True]
-    failed = [r for r in rows if r.get("success") is not True]
-    return {
-        "rows": len(rows),
-        "passed": len(passed),
-        "failed": len(failed),
-        "failed_ids": [instance_id(r) for r in failed],
-        "counts": Counter(instance_id(r) for r in rows),
-    }
+    rows = passed = failed = 0
+    failed_ids = []
+    counts = Counter()
+    for r in iter_results(path):
+        rows += 1
+        iid = instance_id(r)
+        counts[iid] += 1
+        if r.get("success") is True:
+            passed += 1
+        else:
+            failed += 1
+            failed_ids.append(iid)
+    return {"rows": rows, "passed": passed, "failed": failed, "failed_ids": failed_ids, "counts": counts}
 
 
 def require(cond: bool, msg: str, failures: list[str]) -> None:
@@ -68,6 +140,13 @@ def require(cond: bool, msg: str, failures: list[str]) -> None:
         failures.append(msg)
 
 
+def report_failures(failures: list[str]) -> int:
+    print("Verification FAILED:")
+    for f in failures:
+        print(f" - {f}")
+    return 1
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Verify paper_eval_20260213 snapshot")
     parser.add_argument(
@@ -76,14 +155,31 @@ def main() -> int:
         default=Path(__file__).resolve().parents[2] / "artifacts" / "paper_eval_20260213",
         help="Path to snapshot directory",
     )
+    parser.add_argument(
+        "--hash-cache",
+        action="store_true",
+        help=f"Reuse digests of files whose size and mtime are unchanged from {HASH_CACHE_PATH} "
+        "(faster reruns, but a file restored to its old size and mtime is not rehashed)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Run all checks even after a file or hash failure (default: stop before parsing results)",
+    )
     args = parser.parse_args()
 
     base = args.snapshot_dir
     manifest_path = base / "MANIFEST.json"
     failures: list[str] = []
 
-    require(base.exists(), f"Snapshot dir missing: {base}", failures)
-    require(manifest_path.exists(), f"MANIFEST missing: {manifest_path}", failures)
+    # One directory listing instead of a stat per existence check (each is an RPC on network filesystems)
+    try:
+        with os.scandir(base) as it:
+            files = {e.name: Path(e.path) for e in it if e.is_file()}
+    except OSError:
+        files = None
+    require(files is not None, f"Snapshot dir missing: {base}", failures)
+    require(files is not None and manifest_path.name in files, f"MANIFEST missing: {manifest_path}", failures)
     if failures:
         for f in failures:
             print(f"[FAIL] {f}")
@@ -93,23 +189,35 @@ def main() -> int:
 
     # 1) File existence
     for name in EXPECTED_FILES:
-        p = base / name
-        require(p.exists(), f"Missing expected file: {p}", failures)
-
-    # 2) Hash checks
-    for name in EXPECTED_FILES:
-        p = base / name
-        if not p.exists():
-            continue
+        require(name in files, f"Missing expected file: {base / name}", failures)
+
+    # 2) Hash checks (hashlib releases the GIL on large updates, so threads hash in parallel)
+    present = [name for name in EXPECTED_FILES if name in files]
+    hash_cache = load_hash_cache(HASH_CACHE_PATH) if args.hash_cache else {}
+    cache_before = dict(hash_cache)
+    # One worker per file at most: no idle threads when files are missing, no fork/pickle cost of processes
+    with ThreadPoolExecutor(max_workers=max(1, min(len(present), os.cpu_count() or 1))) as ex:
+        digests = ex.map(lambda p: cached_sha256(p, hash_cache), [files[name] for name in present])
+        actual_hashes = dict(zip(present, digests, strict=True))
+    if args.hash_cache and hash_cache != cache_before:
+        save_hash_cache(HASH_CACHE_PATH, hash_cache)
+    for name in present:
         expected_hash = manifest.get("files", {}).get(name, {}).get("sha256")
-        actual_hash = sha256(p)
         require(expected_hash is not None, f"MANIFEST missing sha256 for {name}", failures)
-        require(actual_hash == expected_hash, f"sha256 mismatch for {name}", failures)
+        require(actual_hashes[name] == expected_hash, f"sha256 mismatch for {name}", failures)
+
+    # Missing or tampered files make the count checks below meaningless; skip
+    # parsing the result JSONs unless --full asks for the complete report.
+    if failures and not args.full:
+        return report_failures(failures)
 
     # 3) Recompute checkpoint primary counts
-    ckb = stats_for(base / "checkpoint_blocksworld.json") if (base / "checkpoint_blocksworld.json").exists() else None
-    ckl = stats_for(base / "checkpoint_logistics.json") if (base / "checkpoint_logistics.json").exists() else None
-    ckd = stats_for(base / "checkpoint_depots.json") if (base / "checkpoint_depots.json").exists() else None
+    def stats_if_present(name: str) -> dict | None:
+        return stats_for(files[name]) if name in files else None
+
+    ckb = stats_if_present("checkpoint_blocksworld.json")
+    ckl = stats_if_present("checkpoint_logistics.json")
+    ckd = stats_if_present("checkpoint_depots.json")
 
     if ckb and ckl and ckd:
         # blocksworld
@@ -122,7 +230,7 @@ def main() -> int:
         require(ckl["rows"] == EXPECTED_COUNTS["logistics"][1], "Logistics total mismatch", failures)
         require(ckl["failed"] == EXPECTED_COUNTS["logistics"][3], "Logistics failed count mismatch", failures)
         require(
-            sorted(ckl["failed_ids"]) == sorted(EXPECTED_COUNTS["logistics"][2]),
+            set(ckl["failed_ids"]) == _LOGISTICS_FAILED,
             "Logistics failed IDs mismatch",
             failures,
         )
@@ -131,9 +239,7 @@ def main() -> int:
         require(ckd["passed"] == EXPECTED_COUNTS["depots"][0], "Depots passed mismatch", failures)
         require(ckd["rows"] == EXPECTED_COUNTS["depots"][1], "Depots total mismatch", failures)
         require(ckd["failed"] == EXPECTED_COUNTS["depots"][3], "Depots failed count mismatch", failures)
-        require(
-            sorted(ckd["failed_ids"]) == sorted(EXPECTED_COUNTS["depots"][2]), "Depots failed IDs mismatch", failures
-        )
+        require(set(ckd["failed_ids"]) == _DEPOTS_FAILED, "Depots failed IDs mismatch", failures)
 
         overall_passed = ckb["passed"] + ckl["passed"] + ckd["passed"]
         overall_total = ckb["rows"] + ckl["rows"] + ckd["rows"]
@@ -146,28 +252,17 @@ def main() -> int:
         require(overall_formatted == EXPECTED_OVERALL[3], "Overall formatted mismatch", failures)
 
     # 4) Validate upstream relationship
-    rl = (
-        stats_for(base / "results_logistics_20260213_025757.json")
-        if (base / "results_logistics_20260213_025757.json").exists()
-        else None
-    )
-    rd = (
-        stats_for(base / "results_depots_20260213_014014.json")
-        if (base / "results_depots_20260213_014014.json").exists()
-        else None
-    )
+    rl = stats_if_present("results_logistics_20260213_025757.json")
+    rd = stats_if_present("results_depots_20260213_014014.json")
     if rl and ckl:
-        all_ids = set(rl["counts"]) | set(ckl["counts"])
-        delta = {
-            k: rl["counts"].get(k, 0) - ckl["counts"].get(k, 0)
-            for k in sorted(all_ids)
-            if rl["counts"].get(k, 0) != ckl["counts"].get(k, 0)
-        }
+        # Counter subtraction keeps only positive counts, so two passes give both signs
+        delta = dict(rl["counts"] - ckl["counts"])
+        delta.update((k, -v) for k, v in (ckl["counts"] - rl["counts"]).items())
         require(delta == EXPECTED_RELATION["logistics_delta"], f"Logistics delta mismatch: {delta}", failures)
 
     if rd and ckd:
-        extra = sorted(set(rd["counts"]) - set(ckd["counts"]))
-        require(extra == EXPECTED_RELATION["depots_extra"], f"Depots extra-instance mismatch: {extra}", failures)
+        extra = rd["counts"].keys() - ckd["counts"].keys()
+        require(extra == _DEPOTS_EXTRA, f"Depots extra-instance mismatch: {sorted(extra)}", failures)
 
     # 5) Compare with MANIFEST claims for primary counts
     mp = manifest.get("paper_primary_counts", {})
@@ -186,10 +281,7 @@ def main() -> int:
     )
 
     if failures:
-        print("Verification FAILED:")
-        for f in failures:
-            print(f" - {f}")
-        return 1
+        return report_failures(failures)
 
     print("Verification PASSED")
     print(f"Snapshot: {base}")
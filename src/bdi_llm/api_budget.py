@@ -11,6 +11,8 @@ Key Features:
 - Response caching by prompt hash
 - Early exit detection for hopeless repair cases
 - Budget enforcement (max calls per instance)
+- Concurrency gate for in-flight LLM requests (``api_call_slot``)
+- Optional token-bucket QPS limit on LLM requests (``set_api_qps``)
 
 Author: BDI-LLM Performance Team
 Date: 2026-02-28
@@ -22,6 +24,7 @@ import logging
 import threading
 import time
 from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 from functools import wraps
 from typing import Any
@@ -48,6 +51,88 @@ def get_budget_config():
         return BudgetConfig()
 
 
+def _default_api_concurrency() -> int:
+    """Get the in-flight LLM request cap from Config (fallback: 15)."""
+    try:
+        from .config import Config
+
+        return Config.API_MAX_CONCURRENCY
+    except Exception:
+        return 15
+
+
+# Caps concurrent in-flight LLM requests independently of worker-thread count,
+# so parsing / VAL / file I/O in other threads never wait on an API permit.
+API_SEMAPHORE = threading.BoundedSemaphore(_default_api_concurrency())
+
+
+class TokenBucket:
+    """Thread-safe token bucket: refills ``rate_per_s`` tokens/second up to ``burst``."""
+
+    def __init__(self, rate_per_s: float, burst: int | None = None):
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be positive")
+        self.rate_per_s = float(rate_per_s)
+        self.capacity = float(burst if burst is not None else max(1.0, rate_per_s))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until one token is available and take it.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate_per_s)
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = (1.0 - self._tokens) / self.rate_per_s
+            time.sleep(delay)
+            waited += delay
+
+
+# Request-rate limiter applied inside ``api_call_slot``; None means unlimited.
+API_RATE_LIMITER: TokenBucket | None = None
+
+
+def set_api_qps(rate_per_s: float | None, burst: int | None = None) -> None:
+    """Limit LLM requests to ``rate_per_s`` per second (None or <= 0 disables)."""
+    global API_RATE_LIMITER
+    API_RATE_LIMITER = TokenBucket(rate_per_s, burst) if rate_per_s and rate_per_s > 0 else None
+
+
+def set_api_concurrency(max_in_flight: int) -> None:
+    """Replace the global in-flight request cap (calls already holding a slot are unaffected)."""
+    global API_SEMAPHORE
+    API_SEMAPHORE = threading.BoundedSemaphore(max(1, max_in_flight))
+
+
+@contextmanager
+def api_call_slot():
+    """Hold one ``API_SEMAPHORE`` permit for the duration of a single LLM request.
+
+    When a QPS limit is set, one token is taken from ``API_RATE_LIMITER``
+    right before the request is released, so both concurrency and rate are gated.
+
+    Usage:
+        with api_call_slot():
+            pred = predictor(**inputs)
+    """
+    semaphore = API_SEMAPHORE
+    with semaphore:
+        rate_limiter = API_RATE_LIMITER
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        yield
+
+
 @dataclass
 class APICallRecord:
     """Record of a single API call"""
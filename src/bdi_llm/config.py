@@ -2,10 +2,28 @@ import os
 import re
 from pathlib import Path
 
-from dotenv import load_dotenv
+_DOTENV_LOADED_MARKER = "_BDI_LLM_DOTENV_LOADED"
+_TRUTHY = {"1", "true", "yes", "on"}
+
+
+def _load_dotenv_once() -> None:
+    """Load ``.env`` at most once per process.
+
+    This module is importable as both ``bdi_llm.config`` and
+    ``src.bdi_llm.config`` (and tests reload it); the marker lives in
+    ``os.environ`` so every copy sees it and the dotenv import plus file search
+    is paid once.
+    """
+    if os.environ.get(_DOTENV_LOADED_MARKER):
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    os.environ[_DOTENV_LOADED_MARKER] = "1"
+
 
 # Load environment variables from .env if present
-load_dotenv()
+_load_dotenv_once()
 
 
 def _resolve_key(*env_names: str) -> str | None:
@@ -21,6 +39,21 @@ def _resolve_key(*env_names: str) -> str | None:
     return None
 
 
+def _env_flag(name: str, default: str) -> bool:
+    """Parse a boolean env var ("1", "true", "yes", "on" are truthy)."""
+    return os.environ.get(name, default).lower() in _TRUTHY
+
+
+def _env_int_map(name: str) -> dict[str, int]:
+    """Parse a ``key=int,key=int`` env var into a dict (malformed pairs are skipped)."""
+    parsed = {}
+    for pair in os.environ.get(name, "").split(","):
+        key, sep, value = pair.partition("=")
+        if sep and key.strip() and value.strip().isdigit():
+            parsed[key.strip().lower()] = int(value)
+    return parsed
+
+
 class Config:
     """Central configuration for BDI-LLM Framework."""
 
@@ -35,22 +68,21 @@ class Config:
     # Default to GPT-4o, but allow override
     MODEL_NAME = os.environ.get("LLM_MODEL", "openai/gpt-4o")
     MAX_TOKENS = int(os.environ.get("LLM_MAX_TOKENS", "4000"))
+    # Optional per-domain output ceilings for plan generation, e.g.
+    # "blocksworld=1500,logistics=3000"; unlisted domains keep MAX_TOKENS
+    DOMAIN_MAX_TOKENS = _env_int_map("LLM_DOMAIN_MAX_TOKENS")
     TEMPERATURE = float(os.environ.get("LLM_TEMPERATURE", "0.2"))
     SEED = int(os.environ.get("LLM_SEED", "42"))
-    ENABLE_THINKING = os.environ.get("LLM_ENABLE_THINKING", "true").lower() in {
-        "1",
-        "true",
-        "yes",
-        "on",
-    }
+    ENABLE_THINKING = _env_flag("LLM_ENABLE_THINKING", "true")
     REASONING_EFFORT = os.environ.get("REASONING_EFFORT", "medium")
+    # Mark the static system prompt as a provider-side cache prefix (Anthropic-style APIs)
+    PROMPT_CACHE_ENABLED = _env_flag("LLM_PROMPT_CACHE", "true")
+    # Strip box-drawing decoration from plan-generation prompts (fewer input tokens)
+    COMPRESS_PROMPTS = _env_flag("LLM_COMPRESS_PROMPTS", "false")
+    # Serve repeated identical LM requests from DSPy's memory/disk cache
+    LM_CACHE_ENABLED = _env_flag("LLM_CACHE", "true")
     TIMEOUT = int(os.environ.get("LLM_TIMEOUT", "600"))
-    SAVE_REASONING_TRACE = os.environ.get("SAVE_REASONING_TRACE", "false").lower() in {
-        "1",
-        "true",
-        "yes",
-        "on",
-    }
+    SAVE_REASONING_TRACE = _env_flag("SAVE_REASONING_TRACE", "false")
     REASONING_TRACE_MAX_CHARS = int(os.environ.get("REASONING_TRACE_MAX_CHARS", "8000"))
 
     # Vertex AI Configuration
@@ -63,6 +95,11 @@ class Config:
     API_BUDGET_MAX_RPH = int(os.environ.get("API_BUDGET_MAX_RPH", "1000"))
     API_BUDGET_CACHE_ENABLED = os.environ.get("API_BUDGET_CACHE_ENABLED", "true").lower() == "true"
     API_BUDGET_EARLY_EXIT_ENABLED = os.environ.get("API_BUDGET_EARLY_EXIT_ENABLED", "true").lower() == "true"
+    API_MAX_CONCURRENCY = int(os.environ.get("API_MAX_CONCURRENCY", "15"))
+
+    # Plan Cache Configuration (reuse verified plans for repeated inputs)
+    PLAN_CACHE_ENABLED = _env_flag("BDI_PLAN_CACHE_ENABLED", "false")
+    PLAN_CACHE_PATH = os.environ.get("BDI_PLAN_CACHE_PATH") or None
 
     # Tools Configuration
     # Auto-detect VAL in PlanBench if not provided in env
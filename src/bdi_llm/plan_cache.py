@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Plan Cache — Reuse verified BDI plans for recurring (beliefs, desire) inputs.
+
+A hit skips the whole LLM generation round-trip in ``BDIPlanner.forward``.
+Keys are content hashes of the whitespace/case-normalised domain, domain
+context, beliefs and desire plus a fingerprint of the generation settings
+(model, sampling config, planner sources), so a persistent cache never replays
+plans produced under another model or prompt version. Entries are serialised
+``BDIPlan`` JSON, kept in memory and optionally persisted to SQLite so they
+survive across processes.
+
+Author: BDI-LLM Performance Team
+Date: 2026-10-16
+"""
+
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .config import Config
+from .schemas import BDIPlan
+
+# Keys per SELECT ... IN (...) query; stays under SQLite's host-parameter limit
+_SQLITE_BATCH_SIZE = 500
+
+
+def _normalise(text: str) -> str:
+    """Collapse whitespace and case so formatting-only differences still hit."""
+    return " ".join(text.lower().split())
+
+
+@functools.cache
+def _planner_source_version() -> str:
+    """Hash the package sources (signatures, prompts, verifiers) that shape a plan."""
+    digest = hashlib.sha1()
+    for path in sorted(Path(__file__).resolve().parent.rglob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def generation_fingerprint(lm: Any = None, num_candidates: int = 1) -> str:
+    """Identify the generation settings and planner version a plan was produced under.
+
+    Args:
+        lm: The LM the planner calls (its model and kwargs are included);
+            None falls back to ``Config.MODEL_NAME``.
+        num_candidates: Concurrent candidates per generation.
+    """
+    payload = [
+        getattr(lm, "model", None) or Config.MODEL_NAME,
+        getattr(lm, "kwargs", None),
+        Config.TEMPERATURE,
+        Config.MAX_TOKENS,
+        sorted(Config.DOMAIN_MAX_TOKENS.items()),
+        Config.REASONING_EFFORT,
+        Config.ENABLE_THINKING,
+        Config.SEED,
+        Config.COMPRESS_PROMPTS,
+        num_candidates,
+        _planner_source_version(),
+    ]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """LRU cache of verified plans keyed by ``(domain, domain_context, beliefs, desire)``.
+
+    ``domain_context`` matters for generic PDDL planners, which share a domain
+    name but plan against different domain files. ``generation`` is a
+    ``generation_fingerprint`` of the settings the plan was produced under.
+
+    Args:
+        path: Optional SQLite file for persistence. When set, misses in the
+              in-memory LRU fall through to disk and every ``put`` is written
+              through.
+        max_size: Maximum number of in-memory entries.
+    """
+
+    def __init__(self, path: str | None = None, max_size: int = 1000):
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._db: sqlite3.Connection | None = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS plans (key TEXT PRIMARY KEY, plan_json TEXT NOT NULL)")
+            self._db.commit()
+
+    def _compute_key(
+        self,
+        domain: str,
+        beliefs: str,
+        desire: str,
+        domain_context: str | None = None,
+        generation: str | None = None,
+    ) -> str:
+        """Compute cache key from normalised planning inputs and the generation fingerprint."""
+        payload = "\x1f".join(
+            (
+                _normalise(domain),
+                _normalise(domain_context or ""),
+                _normalise(desire),
+                _normalise(beliefs),
+                generation or "",
+            )
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        domain: str,
+        beliefs: str,
+        desire: str,
+        domain_context: str | None = None,
+        generation: str | None = None,
+    ) -> BDIPlan | None:
+        """Return a fresh copy of the cached plan, or None on miss."""
+        key = self._compute_key(domain, beliefs, desire, domain_context, generation)
+
+        with self._lock:
+            plan_json = self._entries.get(key)
+            if plan_json is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute("SELECT plan_json FROM plans WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    plan_json = row[0]
+                    self._remember(key, plan_json)
+
+            if plan_json is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+
+        return BDIPlan.model_validate_json(plan_json)
+
+    def get_batch(
+        self,
+        domain: str,
+        items: list[tuple[str, str]],
+        domain_context: str | None = None,
+        generation: str | None = None,
+    ) -> list[BDIPlan | None]:
+        """Look up many ``(beliefs, desire)`` pairs at once.
+
+        In-memory misses are fetched from SQLite with one ``IN`` query per
+        chunk of keys instead of one round-trip per item.
+        """
+        keys = [self._compute_key(domain, beliefs, desire, domain_context, generation) for beliefs, desire in items]
+
+        with self._lock:
+            found: dict[str, str] = {}
+            for key in keys:
+                plan_json = self._entries.get(key)
+                if plan_json is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = plan_json
+
+            missing = list(dict.fromkeys(k for k in keys if k not in found))
+            if self._db is not None and missing:
+                for start in range(0, len(missing), _SQLITE_BATCH_SIZE):
+                    chunk = missing[start : start + _SQLITE_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT key, plan_json FROM plans WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, plan_json in rows:
+                        found[key] = plan_json
+                        self._remember(key, plan_json)
+
+            hits = sum(1 for key in keys if key in found)
+            self._hits += hits
+            self._misses += len(keys) - hits
+
+        return [BDIPlan.model_validate_json(found[key]) if key in found else None for key in keys]
+
+    def put(
+        self,
+        domain: str,
+        beliefs: str,
+        desire: str,
+        plan: BDIPlan,
+        domain_context: str | None = None,
+        generation: str | None = None,
+    ) -> None:
+        """Cache a verified plan."""
+        key = self._compute_key(domain, beliefs, desire, domain_context, generation)
+        plan_json = plan.model_dump_json()
+
+        with self._lock:
+            self._remember(key, plan_json)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO plans (key, plan_json) VALUES (?, ?)",
+                    (key, plan_json),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, plan_json: str) -> None:
+        """Insert into the in-memory LRU (caller holds the lock)."""
+        self._entries[key] = plan_json
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            total = self._hits + self._misses
+            hit_rate = self._hits / total if total > 0 else 0.0
+
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": f"{hit_rate:.2%}",
+                "enabled": True,
+            }
+
+
+class NullPlanCache(PlanCache):
+    """No-op cache used when plan caching is disabled."""
+
+    def __init__(self) -> None:
+        super().__init__(max_size=0)
+
+    def get(
+        self,
+        _domain: str,
+        _beliefs: str,
+        _desire: str,
+        _domain_context: str | None = None,
+        _generation: str | None = None,
+    ) -> BDIPlan | None:
+        return None
+
+    def get_batch(
+        self,
+        _domain: str,
+        items: list[tuple[str, str]],
+        _domain_context: str | None = None,
+        _generation: str | None = None,
+    ) -> list[BDIPlan | None]:
+        return [None] * len(items)
+
+    def put(
+        self,
+        _domain: str,
+        _beliefs: str,
+        _desire: str,
+        _plan: BDIPlan,
+        _domain_context: str | None = None,
+        _generation: str | None = None,
+    ) -> None:
+        return None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "size": 0,
+            "hits": 0,
+            "misses": 0,
+            "hit_rate": "0.00%",
+            "enabled": False,
+        }
+
+
+# Global plan cache
+_plan_cache: PlanCache | None = None
+_null_plan_cache = NullPlanCache()
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache(max_size: int = 1000) -> PlanCache:
+    """Get or create the global plan cache (gated by ``Config.PLAN_CACHE_ENABLED``)."""
+    global _plan_cache
+
+    if not Config.PLAN_CACHE_ENABLED:
+        return _null_plan_cache
+
+    with _plan_cache_lock:
+        if _plan_cache is None:
+            _plan_cache = PlanCache(path=Config.PLAN_CACHE_PATH, max_size=max_size)
+        return _plan_cache
@@ -20,6 +20,7 @@ from dataclasses import dataclass
 import networkx as nx
 
 from .schemas import ActionNode, BDIPlan, DependencyEdge
+from .verifier import PlanVerifier
 
 
 @dataclass
@@ -33,6 +34,26 @@ class RepairResult:
     errors: list[str]
 
 
+@dataclass
+class PlanBuilder:
+    """Mutable node/edge lists shared by the repair steps.
+
+    Copied from the input plan once and frozen into a single ``BDIPlan`` at
+    the end, instead of every step copying both lists into a new plan.
+    """
+
+    goal_description: str
+    nodes: list[ActionNode]
+    edges: list[DependencyEdge]
+
+    @classmethod
+    def from_plan(cls, plan: BDIPlan) -> "PlanBuilder":
+        return cls(goal_description=plan.goal_description, nodes=list(plan.nodes), edges=list(plan.edges))
+
+    def build(self) -> BDIPlan:
+        return BDIPlan(goal_description=self.goal_description, nodes=self.nodes, edges=self.edges)
+
+
 class PlanRepairer:
     """
     Automatic plan repair system
@@ -53,18 +74,24 @@ class PlanRepairer:
         nodes: list[ActionNode],
         node_id: str,
         description: str,
+        G: nx.DiGraph | None = None,
     ) -> None:
-        """Append a virtual node only when the ID does not already exist."""
+        """Append a virtual node only when the ID does not already exist.
+
+        When *G* is given, the node is mirrored into it with the same
+        attributes ``BDIPlan.to_networkx()`` would set.
+        """
         if any(node.id == node_id for node in nodes):
             return
-        nodes.append(
-            ActionNode(
-                id=node_id,
-                action_type="Virtual",
-                params={},
-                description=description,
-            )
+        node = ActionNode(
+            id=node_id,
+            action_type="Virtual",
+            params={},
+            description=description,
         )
+        nodes.append(node)
+        if G is not None:
+            G.add_node(node_id, _declared=True, **node.model_dump())
 
     @classmethod
     def repair(cls, plan: BDIPlan) -> RepairResult:
@@ -82,13 +109,13 @@ class PlanRepairer:
         # Convert to NetworkX
         G = plan.to_networkx()
 
-        # Check if already valid
-        from .verifier import PlanVerifier
-
-        result = PlanVerifier.verify(G)
+        # Check if already valid; the topological order doubles as the DAG test
+        result, order = PlanVerifier.verify_and_sort(G)
         is_valid = result.is_valid
         verify_errors = result.hard_errors
-        has_disconnected_components = G.number_of_nodes() > 0 and not nx.is_weakly_connected(G)
+        # One traversal both tests connectivity and enumerates components for step 2
+        components = list(nx.weakly_connected_components(G))
+        has_disconnected_components = len(components) > 1
 
         # Even when structurally valid, we still repair disconnected components to
         # preserve the historical auto-connect behavior of this module.
@@ -98,35 +125,48 @@ class PlanRepairer:
         # Attempt repairs
         try:
             # 1. Fix cycles (must be done FIRST - cycles prevent topological ordering)
-            if not nx.is_directed_acyclic_graph(G):
+            if not order and G.number_of_nodes() > 0:  # no order for a non-empty graph means a cycle
                 plan = cls._break_cycles(plan)
                 repairs.append("Broke cycles to convert graph to DAG")
                 G = plan.to_networkx()
+                components = list(nx.weakly_connected_components(G))
+
+            # Steps 2-4 update one builder and G in place instead of rebuilding
+            # both per step; to_networkx() graphs are memoised and shared, so
+            # work on a copy.
+            G = G.copy()
+            builder = PlanBuilder.from_plan(plan)
+            structural_repairs = len(repairs)
 
             # 2. Fix disconnected subgraphs
-            if not nx.is_weakly_connected(G):
-                plan = cls._connect_subgraphs(plan, G)
+            if len(components) > 1:
+                cls._connect_subgraphs(builder, G, components)
                 repairs.append("Connected disconnected subgraphs with virtual nodes")
-                G = plan.to_networkx()
 
             # 3. Ensure single root (no incoming edges)
             roots = cls._find_roots(G)
             if len(roots) > 1:
-                plan = cls._unify_roots(plan, roots)
+                cls._unify_roots(builder, roots, G)
                 repairs.append(f"Unified {len(roots)} root nodes with virtual START")
-                G = plan.to_networkx()
 
             # 4. Ensure single terminal (no outgoing edges)
             terminals = cls._find_terminals(G)
             if len(terminals) > 1:
-                plan = cls._unify_terminals(plan, terminals)
+                cls._unify_terminals(builder, terminals, G)
                 repairs.append(f"Unified {len(terminals)} terminal nodes with virtual END")
-                G = plan.to_networkx()
 
-            # 4. Re-verify
-            verifier_result = PlanVerifier.verify(G)
-            is_valid = verifier_result.is_valid
-            verify_errors = verifier_result.hard_errors
+            if len(repairs) > structural_repairs:
+                plan = builder.build()
+
+            # 4. Re-verify (unchanged graph: the initial verdict still holds)
+            if repairs:
+                verifier_result = PlanVerifier.verify(G)
+                is_valid = verifier_result.is_valid
+                verify_errors = verifier_result.hard_errors
+            if is_valid:
+                # G already mirrors the repaired plan; later to_networkx() calls
+                # (canonicalize, callers re-verifying) reuse it.
+                plan.prime_graph_cache(G)
 
             return RepairResult(
                 success=is_valid,
@@ -146,7 +186,12 @@ class PlanRepairer:
             )
 
     @classmethod
-    def _connect_subgraphs(cls, plan: BDIPlan, G: nx.DiGraph) -> BDIPlan:
+    def _connect_subgraphs(
+        cls,
+        builder: PlanBuilder,
+        G: nx.DiGraph,
+        components: list[set[str]] | None = None,
+    ) -> None:
         """
         Connect disconnected subgraphs using virtual START/END nodes
 
@@ -156,58 +201,60 @@ class PlanRepairer:
         3. Connect START to root of each component
         4. Create virtual END node
         5. Connect terminal of each component to END
+
+        *builder* and *G* (the caller's own graph of the plan being built) are
+        updated in place. Pass *components* when the caller has already
+        enumerated them.
         """
         # Get connected components
-        components = list(nx.weakly_connected_components(G))
+        if components is None:
+            components = list(nx.weakly_connected_components(G))
 
         if len(components) <= 1:
-            return plan  # Already connected
-
-        # Create new nodes and edges lists
-        new_nodes = list(plan.nodes)
-        new_edges = list(plan.edges)
+            return  # Already connected
 
         # Add virtual START only once
         cls._append_virtual_node_once(
-            new_nodes,
+            builder.nodes,
             cls.VIRTUAL_START,
             "Virtual start node (plan initialization)",
+            G,
         )
 
         # Add virtual END only once
         cls._append_virtual_node_once(
-            new_nodes,
+            builder.nodes,
             cls.VIRTUAL_END,
             "Virtual end node (plan completion)",
+            G,
         )
 
-        # For each component, connect START to roots and terminals to END
-        for component in components:
-            # Find root nodes in this component (no incoming edges from within component)
-            roots_in_component = []
-            for node_id in component:
-                if component.isdisjoint(G.predecessors(node_id)):
-                    roots_in_component.append(node_id)
-
-            # Connect START to each root
-            for root_id in roots_in_component:
-                if root_id == cls.VIRTUAL_START:
-                    continue
-                new_edges.append(DependencyEdge(source=cls.VIRTUAL_START, target=root_id))
-
-            # Find terminal nodes in this component (no outgoing edges)
-            terminals_in_component = []
-            for node_id in component:
-                if component.isdisjoint(G.successors(node_id)):
-                    terminals_in_component.append(node_id)
-
-            # Connect each terminal to END
-            for terminal_id in terminals_in_component:
-                if terminal_id == cls.VIRTUAL_END:
-                    continue
-                new_edges.append(DependencyEdge(source=terminal_id, target=cls.VIRTUAL_END))
-
-        return BDIPlan(goal_description=plan.goal_description, nodes=new_nodes, edges=new_edges)
+        # A weakly connected component contains every neighbour of its nodes, so
+        # "no predecessors in the component" is just "no predecessors": compute
+        # roots/terminals once and intersect per component.
+        global_roots = set(cls._find_roots(G))
+        global_terminals = set(cls._find_terminals(G))
+
+        # Connect START to each component's roots and each component's terminals
+        # to END (pairs are gathered before G changes, so components stay valid)
+        start_pairs = [
+            (cls.VIRTUAL_START, root_id)
+            for component in components
+            for root_id in component & global_roots
+            if root_id != cls.VIRTUAL_START
+        ]
+        end_pairs = [
+            (terminal_id, cls.VIRTUAL_END)
+            for component in components
+            for terminal_id in component & global_terminals
+            if terminal_id != cls.VIRTUAL_END
+        ]
+
+        # An input that already holds isolated START/END nodes yields START -> END
+        # from both sides; dedupe (in order) before allocating DependencyEdges.
+        pairs = list(dict.fromkeys((*start_pairs, *end_pairs)))
+        builder.edges.extend(DependencyEdge(source=u, target=v) for u, v in pairs)
+        G.add_edges_from(pairs, relationship="depends_on")
 
     @classmethod
     def _break_cycles(cls, plan: BDIPlan) -> BDIPlan:
@@ -280,13 +327,16 @@ class PlanRepairer:
 
         # If no back edges found but graph has cycles, fall back to simple cycle breaking
         if not edges_to_remove and not nx.is_directed_acyclic_graph(G):
-            # Fallback: for each simple cycle, remove one edge
-            cycles = list(nx.simple_cycles(G))
-            for cycle in cycles:
-                if len(cycle) >= 2:
-                    # Remove edge from last node to first node in cycle
-                    # This breaks the cycle
-                    edges_to_remove.add((cycle[-1], cycle[0]))
+            # Fallback: repeatedly find one cycle (O(V+E), unlike enumerating
+            # every simple cycle) and remove the edge that closes it
+            residual = G.copy()
+            while True:
+                try:
+                    closing_source, closing_target = nx.find_cycle(residual)[-1][:2]
+                except nx.NetworkXNoCycle:
+                    break
+                residual.remove_edge(closing_source, closing_target)
+                edges_to_remove.add((closing_source, closing_target))
 
         # Remove the back edges from the plan
         if edges_to_remove:
@@ -298,53 +348,45 @@ class PlanRepairer:
 
     @classmethod
     def _find_roots(cls, G: nx.DiGraph) -> list[str]:
-        """Find nodes with no incoming edges"""
-        return [n for n in G.nodes() if G.in_degree(n) == 0]
+        """Find nodes with no incoming edges (one pass over the predecessor dict)"""
+        return [n for n, preds in G.pred.items() if not preds]
 
     @classmethod
     def _find_terminals(cls, G: nx.DiGraph) -> list[str]:
-        """Find nodes with no outgoing edges"""
-        return [n for n in G.nodes() if G.out_degree(n) == 0]
+        """Find nodes with no outgoing edges (one pass over the successor dict)"""
+        return [n for n, succs in G.succ.items() if not succs]
 
     @classmethod
-    def _unify_roots(cls, plan: BDIPlan, roots: list[str]) -> BDIPlan:
-        """Add virtual START and connect to all roots"""
-        new_nodes = list(plan.nodes)
-        new_edges = list(plan.edges)
-
+    def _unify_roots(cls, builder: PlanBuilder, roots: list[str], G: nx.DiGraph) -> None:
+        """Add virtual START and connect to all roots (mirrored into *G*)"""
         # Add virtual START only if missing
         cls._append_virtual_node_once(
-            new_nodes,
+            builder.nodes,
             cls.VIRTUAL_START,
             "Virtual start node",
+            G,
         )
 
         # Connect START to each root
-        for root_id in roots:
-            if root_id != cls.VIRTUAL_START:
-                new_edges.append(DependencyEdge(source=cls.VIRTUAL_START, target=root_id))
-
-        return BDIPlan(goal_description=plan.goal_description, nodes=new_nodes, edges=new_edges)
+        added = [DependencyEdge(source=cls.VIRTUAL_START, target=r) for r in roots if r != cls.VIRTUAL_START]
+        builder.edges.extend(added)
+        G.add_edges_from((e.source, e.target, {"relationship": e.relationship}) for e in added)
 
     @classmethod
-    def _unify_terminals(cls, plan: BDIPlan, terminals: list[str]) -> BDIPlan:
-        """Add virtual END and connect all terminals to it"""
-        new_nodes = list(plan.nodes)
-        new_edges = list(plan.edges)
-
+    def _unify_terminals(cls, builder: PlanBuilder, terminals: list[str], G: nx.DiGraph) -> None:
+        """Add virtual END and connect all terminals to it (mirrored into *G*)"""
         # Add virtual END only if missing
         cls._append_virtual_node_once(
-            new_nodes,
+            builder.nodes,
             cls.VIRTUAL_END,
             "Virtual end node",
+            G,
         )
 
         # Connect each terminal to END
-        for terminal_id in terminals:
-            if terminal_id != cls.VIRTUAL_END:
-                new_edges.append(DependencyEdge(source=terminal_id, target=cls.VIRTUAL_END))
-
-        return BDIPlan(goal_description=plan.goal_description, nodes=new_nodes, edges=new_edges)
+        added = [DependencyEdge(source=t, target=cls.VIRTUAL_END) for t in terminals if t != cls.VIRTUAL_END]
+        builder.edges.extend(added)
+        G.add_edges_from((e.source, e.target, {"relationship": e.relationship}) for e in added)
 
 
 class PlanCanonicalizer:
@@ -370,8 +412,11 @@ class PlanCanonicalizer:
         """
         G = plan.to_networkx()
 
-        # Remove self-loops
-        G.remove_edges_from(nx.selfloop_edges(G))
+        # Remove self-loops (on a copy: to_networkx() graphs are memoised and shared);
+        # stop at the first loop found instead of counting them all
+        if next(nx.selfloop_edges(G), None) is not None:
+            G = G.copy()
+            G.remove_edges_from(list(nx.selfloop_edges(G)))
 
         # Get topological order for node renaming
         try:
@@ -380,8 +425,24 @@ class PlanCanonicalizer:
             # Has cycles - just use original order
             topo_order = [n.id for n in plan.nodes]
 
-        # Create ID mapping
-        id_mapping = {old_id: f"action_{i + 1}" for i, old_id in enumerate(topo_order)}
+        # Fast path: nodes already named action_1..action_n in topological order
+        # and edges already unique, loop-free and default-typed (e.g. a plan that
+        # was canonicalized before) — rebuilding would reproduce the same plan.
+        if (
+            len(topo_order) == len(plan.nodes)
+            and all(
+                node.id == old_id == f"action_{i + 1}"
+                for i, (node, old_id) in enumerate(zip(plan.nodes, topo_order, strict=True))
+            )
+            and all(e.source != e.target and e.relationship == "depends_on" for e in plan.edges)
+            and len({(e.source, e.target) for e in plan.edges}) == len(plan.edges)
+        ):
+            return plan
+
+        # Map IDs to integer positions; canonical strings are formatted once per
+        # node and edges are deduplicated on cheap int pairs
+        topo_index = {old_id: i for i, old_id in enumerate(topo_order)}
+        canonical_ids = [f"action_{i + 1}" for i in range(len(topo_order))]
 
         # Create new nodes with canonical IDs
         node_map = {n.id: n for n in plan.nodes}
@@ -392,26 +453,21 @@ class PlanCanonicalizer:
                 old_node = node_map[old_id]
                 new_nodes.append(
                     ActionNode(
-                        id=id_mapping[old_id],
+                        id=canonical_ids[topo_index[old_id]],
                         action_type=old_node.action_type,
                         params=old_node.params,
                         description=old_node.description,
                     )
                 )
 
-        # Create new edges with canonical IDs
-        new_edges = []
-        seen_edges = set()
-
-        for edge in plan.edges:
-            if edge.source in id_mapping and edge.target in id_mapping:
-                new_source = id_mapping[edge.source]
-                new_target = id_mapping[edge.target]
-
-                edge_key = (new_source, new_target)
-                if edge_key not in seen_edges and new_source != new_target:
-                    new_edges.append(DependencyEdge(source=new_source, target=new_target))
-                    seen_edges.add(edge_key)
+        # Create new edges with canonical IDs; dict keys dedupe in insertion order
+        index_of = topo_index.get
+        pairs = {
+            (src, dst): None
+            for edge in plan.edges
+            if (src := index_of(edge.source)) is not None and (dst := index_of(edge.target)) is not None and src != dst
+        }
+        new_edges = [DependencyEdge(source=canonical_ids[src], target=canonical_ids[dst]) for src, dst in pairs]
 
         return BDIPlan(goal_description=plan.goal_description, nodes=new_nodes, edges=new_edges)
 
@@ -2,15 +2,36 @@
 
 Re-exports the public API so that ``from src.bdi_llm.planner import BDIPlanner``
 and ``from src.bdi_llm.planner import configure_dspy`` continue to work.
+
+The re-exports are resolved lazily (PEP 562): importing a DSPy-free submodule
+such as ``planner.domain_spec`` no longer pulls in ``dspy`` and its
+litellm/openai dependency tree.
 """
 
-from .bdi_engine import BDIPlanner  # noqa: F401
-from .domain_spec import DomainSpec  # noqa: F401
-from .dspy_config import configure_dspy  # noqa: F401
-from .signatures import (  # noqa: F401
-    GeneratePlan,
-    GeneratePlanDepots,
-    GeneratePlanGeneric,
-    GeneratePlanLogistics,
-    RepairPlan,
-)
+import importlib
+
+_EXPORTS = {
+    "BDIPlanner": ".bdi_engine",
+    "DomainSpec": ".domain_spec",
+    "configure_dspy": ".dspy_config",
+    "GeneratePlan": ".signatures",
+    "GeneratePlanDepots": ".signatures",
+    "GeneratePlanGeneric": ".signatures",
+    "GeneratePlanLogistics": ".signatures",
+    "RepairPlan": ".signatures",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
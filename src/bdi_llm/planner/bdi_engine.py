@@ -2,20 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import functools
 import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import dspy
 import yaml
 
-from ..api_budget import get_budget_manager, get_repair_cache
+from ..api_budget import api_call_slot, get_budget_manager, get_repair_cache
 from ..config import Config
+from ..plan_cache import PlanCache, generation_fingerprint, get_plan_cache
+from ..plan_repair import repair_and_verify
 from ..schemas import ActionNode, BDIPlan, DependencyEdge
 from ..verifier import PlanVerifier
 from .dspy_config import configure_dspy
+from .prompts import compress_instructions
 from .signatures import (
     GeneratePlanGeneric,
     RepairPlan,
@@ -27,13 +34,37 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-# 3. Define the Module with Assertions
+@functools.cache
+def _chain_of_thought_template(signature_class: type[dspy.Signature]) -> dspy.ChainOfThought:
+    """Build the ChainOfThought for *signature_class* once per process.
+
+    Construction re-derives the extended (``reasoning``-prepended) signature
+    class, which costs milliseconds; callers take a ``deepcopy()`` so demos and
+    traces stay per planner.
+    """
+    return dspy.ChainOfThought(signature_class)
+
+
+def _normalise_symbol(value: str) -> str:
+    """Canonical form for comparing PDDL action/parameter names."""
+    return str(value).strip().lower().lstrip("?").replace("_", "-")
+
+
+@functools.cache
+def _compressed_signature(signature_class: type[dspy.Signature]) -> type[dspy.Signature]:
+    """*signature_class* with ``compress_instructions`` applied, built once per class."""
+    return signature_class.with_instructions(compress_instructions(signature_class.instructions))
+
+
+# 3. Define the Module
 class BDIPlanner(dspy.Module):
     def __init__(
         self,
         auto_repair: bool = True,
         domain: str = "blocksworld",
         domain_spec: DomainSpec | None = None,
+        lm: dspy.BaseLM | None = None,
+        num_candidates: int = 1,
     ):
         """
         Initialize BDI Planner.
@@ -47,11 +78,21 @@ class BDIPlanner(dspy.Module):
                          is ignored and all configuration is taken from the
                          spec. Use ``DomainSpec.from_pddl()`` for generic
                          PDDL domains.
+            lm: Optional LM for this planner's predictors. When given, the
+                process-wide DSPy configuration is left untouched, so several
+                planners (or tests) can share one LM instance without building
+                the configured default.
+            num_candidates: Plans requested concurrently per generation. The
+                first to pass structural verification is used, hiding the
+                latency of a bad sample behind a good one at the cost of up to
+                ``num_candidates`` LLM calls. ``1`` (default) keeps the single
+                sequential request.
         """
         super().__init__()
 
         # Configure DSPy (idempotent - only runs once per process)
-        configure_dspy()
+        if lm is None:
+            configure_dspy()
 
         # ----- resolve DomainSpec -----
         if domain_spec is not None:
@@ -67,9 +108,13 @@ class BDIPlanner(dspy.Module):
         self._is_generic = self._domain_spec.signature_class is GeneratePlanGeneric
 
         # Internal DSPy program (renamed from ``self.generate_plan``)
-        self._generate_program = dspy.ChainOfThought(self._domain_spec.signature_class)
-        self.repair_plan = dspy.ChainOfThought(RepairPlan)
+        signature_class = self._domain_spec.signature_class
+        if Config.COMPRESS_PROMPTS:
+            signature_class = _compressed_signature(signature_class)
+        self._generate_program = _chain_of_thought_template(signature_class).deepcopy()
+        self.repair_plan = _chain_of_thought_template(RepairPlan).deepcopy()
         self.auto_repair = auto_repair
+        self.num_candidates = max(1, num_candidates)
         self._last_generation_trace: dict[str, Any] = {}
         self._last_repair_trace: dict[str, Any] = {}
 
@@ -77,6 +122,9 @@ class BDIPlanner(dspy.Module):
         if self._domain_spec.demos_loader is not None:
             self._generate_program.demos = self._domain_spec.demos_loader()
 
+        if lm is not None:
+            self.set_lm(lm)
+
     @staticmethod
     def _build_logistics_demos():
         """Build few-shot demonstrations for the Logistics domain.
@@ -114,22 +162,27 @@ class BDIPlanner(dspy.Module):
 
         return demos
 
+    def _normalised_constraints(self) -> tuple[frozenset[str], dict[str, frozenset[str]]]:
+        """Normalised valid action types and required params, computed once per DomainSpec."""
+        cached = self.__dict__.get("_constraints_cache")
+        if cached is None or cached[0] is not self._domain_spec:
+            valid_types = frozenset(_normalise_symbol(v) for v in self._domain_spec.valid_action_types)
+            required_params = {
+                _normalise_symbol(k): frozenset(_normalise_symbol(p) for p in v)
+                for k, v in self._domain_spec.required_params.items()
+            }
+            cached = (self._domain_spec, valid_types, required_params)
+            self._constraints_cache = cached
+        return cached[1], cached[2]
+
     def _validate_action_constraints(self, plan_obj) -> tuple:
         """Validate action_type and params against domain constraints.
 
         Returns:
             (all_valid, error_message) — error_message is empty when valid.
         """
-
-        def _normalise_symbol(value: str) -> str:
-            return str(value).strip().lower().lstrip("?").replace("_", "-")
-
         valid_types_raw = self._domain_spec.valid_action_types
-        valid_types = {_normalise_symbol(v) for v in valid_types_raw}
-        required_params = {
-            _normalise_symbol(k): {_normalise_symbol(p) for p in v}
-            for k, v in self._domain_spec.required_params.items()
-        }
+        valid_types, required_params = self._normalised_constraints()
 
         if not valid_types:
             return True, ""
@@ -250,6 +303,7 @@ class BDIPlanner(dspy.Module):
         beliefs: str,
         desire: str,
         domain_context: str | None = None,
+        rollout_id: int | None = None,
     ) -> dspy.Prediction:
         """Generate a BDI plan.
 
@@ -265,11 +319,19 @@ class BDIPlanner(dspy.Module):
             domain_context: Optional action-schema summary for generic PDDL.
                             Falls back to ``self._domain_spec.domain_context``
                             when not explicitly supplied.
+            rollout_id: Optional DSPy rollout ID; distinct IDs sample separate
+                        completions instead of hitting the LM cache.
 
         Returns:
             ``dspy.Prediction`` with a ``plan`` attribute.
         """
         ctx = domain_context or self._domain_spec.domain_context
+        call_config = {}
+        if rollout_id is not None:
+            call_config["rollout_id"] = rollout_id
+        if self.domain.lower() in Config.DOMAIN_MAX_TOKENS:
+            call_config["max_tokens"] = Config.DOMAIN_MAX_TOKENS[self.domain.lower()]
+        lm_config = {"config": call_config} if call_config else {}
 
         if self._is_generic:
             if not ctx:
@@ -278,13 +340,16 @@ class BDIPlanner(dspy.Module):
                     "but none was provided and DomainSpec.domain_context is empty. "
                     "Pass domain_context= explicitly or use DomainSpec.from_pddl()."
                 )
-            pred = self._generate_program(
-                beliefs=beliefs,
-                desire=desire,
-                domain_context=ctx,
-            )
+            with api_call_slot():
+                pred = self._generate_program(
+                    beliefs=beliefs,
+                    desire=desire,
+                    domain_context=ctx,
+                    **lm_config,
+                )
         else:
-            pred = self._generate_program(beliefs=beliefs, desire=desire)
+            with api_call_slot():
+                pred = self._generate_program(beliefs=beliefs, desire=desire, **lm_config)
 
         return pred
 
@@ -298,12 +363,191 @@ class BDIPlanner(dspy.Module):
         desire: str,
         domain_context: str | None = None,
     ) -> dspy.Prediction:
-        # Generate the plan via unified wrapper
-        pred = self.generate_plan(
-            beliefs=beliefs,
-            desire=desire,
-            domain_context=domain_context,
+        # Reuse a verified plan for identical inputs and skip the LLM call
+        plan_cache = get_plan_cache()
+        cached_pred = self._cached_prediction(
+            plan_cache.get(self.domain, beliefs, desire, *self._cache_scope(domain_context))
+        )
+        if cached_pred is not None:
+            self._record_cache_hit_trace()
+            return cached_pred
+        return self._generate_and_verify(beliefs, desire, domain_context, plan_cache)
+
+    async def aforward(
+        self,
+        beliefs: str,
+        desire: str,
+        domain_context: str | None = None,
+    ) -> dspy.Prediction:
+        """Async ``forward`` (reached via ``await planner.acall(...)``).
+
+        A cache miss runs the synchronous generate/verify/repair path in a
+        worker thread, as ``aforward_batch`` does, so neither the LLM round-trip
+        nor the NetworkX checks block the event loop.
+        """
+        plan_cache = get_plan_cache()
+        cached_pred = self._cached_prediction(
+            plan_cache.get(self.domain, beliefs, desire, *self._cache_scope(domain_context))
+        )
+        if cached_pred is not None:
+            self._record_cache_hit_trace()
+            return cached_pred
+        return await asyncio.to_thread(self._generate_and_verify, beliefs, desire, domain_context, plan_cache)
+
+    def forward_batch(
+        self,
+        items: list[tuple[str, str]],
+        domain_context: str | None = None,
+        max_workers: int = 1,
+    ) -> list[dspy.Prediction]:
+        """Run ``forward`` over many ``(beliefs, desire)`` pairs.
+
+        All plan-cache lookups are resolved in one batch (a single SQLite query
+        for the persistent backend); only the misses reach the LLM, optionally
+        fanned out over ``max_workers`` threads. Results keep input order.
+
+        Raises:
+            ValueError: As ``forward`` does, for the first miss that fails.
+        """
+        plan_cache, results, misses = self._partition_batch(items, domain_context)
+
+        def run(i: int) -> dspy.Prediction:
+            beliefs, desire = items[i]
+            return self._generate_and_verify(beliefs, desire, domain_context, plan_cache)
+
+        if max_workers > 1 and len(misses) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(misses))) as ex:
+                for i, pred in zip(misses, ex.map(run, misses), strict=True):
+                    results[i] = pred
+        else:
+            for i in misses:
+                results[i] = run(i)
+        return results
+
+    async def aforward_batch(
+        self,
+        items: list[tuple[str, str]],
+        domain_context: str | None = None,
+    ) -> list[dspy.Prediction]:
+        """Async ``forward_batch``: all cache misses are in flight at once.
+
+        Each miss runs the synchronous generate/verify path in a worker thread
+        (``asyncio.to_thread``), so the blocking ``api_call_slot`` gate still
+        bounds concurrent LLM requests without stalling the event loop.
+
+        Raises:
+            ValueError: As ``forward`` does, for the first miss that fails.
+        """
+        plan_cache, results, misses = self._partition_batch(items, domain_context)
+        preds = await asyncio.gather(
+            *(asyncio.to_thread(self._generate_and_verify, *items[i], domain_context, plan_cache) for i in misses)
         )
+        for i, pred in zip(misses, preds, strict=True):
+            results[i] = pred
+        return results
+
+    def _partition_batch(
+        self, items: list[tuple[str, str]], domain_context: str | None
+    ) -> tuple[PlanCache, list[dspy.Prediction | None], list[int]]:
+        """Resolve cache hits for a batch; return the cache, results and miss indices."""
+        plan_cache = get_plan_cache()
+        cached_plans = plan_cache.get_batch(self.domain, items, *self._cache_scope(domain_context))
+        results: list[dspy.Prediction | None] = [self._cached_prediction(plan) for plan in cached_plans]
+        misses = [i for i, pred in enumerate(results) if pred is None]
+        return plan_cache, results, misses
+
+    def _cache_scope(self, domain_context: str | None) -> tuple[str | None, str]:
+        """Plan-cache key parts beyond the inputs: the domain context ``generate_plan``
+        resolves and the fingerprint of the LM and generation settings in use."""
+        return (
+            domain_context or self._domain_spec.domain_context,
+            generation_fingerprint(self._generate_program.predict.lm or dspy.settings.lm, self.num_candidates),
+        )
+
+    def _record_cache_hit_trace(self) -> None:
+        """Replace the previous call's trace: a cache hit made no LLM call."""
+        self._last_generation_trace = {"phase": "generation", "model": Config.MODEL_NAME, "plan_cache_hit": True}
+
+    @staticmethod
+    def _cached_prediction(cached_plan: BDIPlan | None) -> dspy.Prediction | None:
+        """Wrap a cache hit that still passes structural verification."""
+        if cached_plan is None:
+            return None
+        cached_valid, _ = PlanVerifier.verify(cached_plan.to_networkx())
+        if not cached_valid:
+            return None
+        return dspy.Prediction(plan=cached_plan, plan_cache_hit=True)
+
+    def _generate_candidates(
+        self,
+        beliefs: str,
+        desire: str,
+        domain_context: str | None,
+    ) -> dspy.Prediction:
+        """Request ``num_candidates`` plans at once; return the first to verify.
+
+        Candidate 0 is the ordinary request; the others carry distinct
+        ``rollout_id``s so they are sampled rather than served from the LM
+        cache. Each runs in a copy of the caller's context, so ``dspy.context``
+        settings (LM, per-call options) reach the worker threads. When no
+        candidate verifies, candidate 0 (or the first that did not raise) is
+        returned for the usual repair path.
+
+        Once a candidate verifies, queued candidates are cancelled but requests
+        already in flight cannot be: they finish in the background, still
+        holding an ``api_call_slot`` and counting against the API budget. At
+        most ``num_candidates - 1`` such calls outlive each plan.
+        """
+
+        def run(i: int) -> dspy.Prediction:
+            return self.generate_plan(beliefs, desire, domain_context, rollout_id=i or None)
+
+        outcomes: dict[int, dspy.Prediction | Exception] = {}
+        executor = ThreadPoolExecutor(max_workers=self.num_candidates)
+        try:
+            futures = {executor.submit(contextvars.copy_context().run, run, i): i for i in range(self.num_candidates)}
+            for future in as_completed(futures):
+                try:
+                    pred = future.result()
+                except Exception as e:
+                    outcomes[futures[future]] = e
+                    continue
+                if self._is_structurally_valid(pred):
+                    return pred
+                outcomes[futures[future]] = pred
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for i in sorted(outcomes):
+            if not isinstance(outcomes[i], Exception):
+                return outcomes[i]
+        raise outcomes[0]
+
+    def _is_structurally_valid(self, pred: dspy.Prediction) -> bool:
+        """True if *pred* holds a plan that passes the action and graph checks."""
+        plan_obj = getattr(pred, "plan", None)
+        if not isinstance(plan_obj, BDIPlan):
+            return False
+        constraints_ok, _ = self._validate_action_constraints(plan_obj)
+        return constraints_ok and PlanVerifier.verify(plan_obj.to_networkx()).is_valid
+
+    def _generate_and_verify(
+        self,
+        beliefs: str,
+        desire: str,
+        domain_context: str | None,
+        plan_cache: PlanCache,
+    ) -> dspy.Prediction:
+        """Cache-miss path of ``forward``: generate, verify, auto-repair, cache."""
+        # Generate the plan via unified wrapper
+        if self.num_candidates > 1:
+            pred = self._generate_candidates(beliefs, desire, domain_context)
+        else:
+            pred = self.generate_plan(
+                beliefs=beliefs,
+                desire=desire,
+                domain_context=domain_context,
+            )
         self.record_generation_trace(pred)
 
         try:
@@ -327,8 +571,6 @@ class BDIPlanner(dspy.Module):
 
             # Try auto-repair if enabled and plan is invalid
             if not is_valid and self.auto_repair:
-                from ..plan_repair import repair_and_verify
-
                 repaired_plan, repaired_valid, messages = repair_and_verify(plan_obj)
 
                 if repaired_valid:
@@ -349,6 +591,8 @@ class BDIPlanner(dspy.Module):
             if not is_valid:
                 # Return the invalid plan - let external repair handle it
                 pred.plan = plan_obj
+            else:
+                plan_cache.put(self.domain, beliefs, desire, pred.plan, *self._cache_scope(domain_context))
         except Exception as e:
             # Handle potential pydantic validation errors or parsing issues
             raise ValueError(f"Failed to generate a valid plan object. Error: {str(e)}") from e
@@ -561,15 +805,16 @@ class BDIPlanner(dspy.Module):
             history_str = self._format_repair_history(repair_history)
             verifier_feedback_str = self._format_verification_feedback(verification_feedback)
 
-            pred = self.repair_plan(
-                beliefs=beliefs,
-                desire=desire,
-                previous_plan="\n".join(previous_plan_actions),
-                val_errors="\n".join(val_errors),
-                repair_history=history_str,
-                verification_feedback=verifier_feedback_str,
-                domain_context=domain_context or "",
-            )
+            with api_call_slot():
+                pred = self.repair_plan(
+                    beliefs=beliefs,
+                    desire=desire,
+                    previous_plan="\n".join(previous_plan_actions),
+                    val_errors="\n".join(val_errors),
+                    repair_history=history_str,
+                    verification_feedback=verifier_feedback_str,
+                    domain_context=domain_context or "",
+                )
             self._last_repair_trace = self._capture_prediction_trace(pred, phase="val_repair")
 
             # RECORD CALL against budget
@@ -592,8 +837,6 @@ class BDIPlanner(dspy.Module):
 
             # Try structural auto-repair if needed
             if not is_valid and self.auto_repair:
-                from ..plan_repair import repair_and_verify
-
                 repaired_plan, repaired_valid, messages = repair_and_verify(plan_obj)
                 if repaired_valid:
                     pred.plan = repaired_plan
@@ -635,8 +878,8 @@ def main():
     print("Generating Plan...")
 
     try:
-        # Run the planner
-        # dspy.Suggest/Assert will automatically retry if validation fails
+        # Run the planner (single generation: invalid plans come back for
+        # external repair; unusable output raises ValueError)
         response = planner(beliefs=beliefs, desire=desire)
         final_plan = response.plan
 
@@ -653,11 +896,12 @@ def main():
 
         # Verify final result
         G = final_plan.to_networkx()
-        print(f"\nFinal Graph Valid? {PlanVerifier.verify(G)[0]}")
+        result, order = PlanVerifier.verify_and_sort(G)
+        print(f"\nFinal Graph Valid? {result.is_valid}")
 
-        if PlanVerifier.verify(G)[0]:
+        if result.is_valid:
             print("\nExecution Order:")
-            print(" -> ".join(PlanVerifier.topological_sort(G)))
+            print(" -> ".join(order))
 
     except ValueError as e:
         print(f"\n❌ Planning Failed: {e}")
@@ -11,6 +11,7 @@ A generic PDDL spec can be constructed from raw domain PDDL text via
 
 from __future__ import annotations
 
+import functools
 import json
 import re
 from collections.abc import Callable
@@ -459,7 +460,7 @@ class DomainSpec:
 
     Bundles all domain-specific configuration that ``BDIPlanner`` needs:
     - which DSPy Signature to use,
-    - valid action types and required parameters (for ``dspy.Assert``),
+    - valid action types and required parameters (checked after generation),
     - optional few-shot demo loader,
     - optional raw PDDL text and derived domain context.
     """
@@ -612,19 +613,25 @@ class DomainSpec:
 def _build_logistics_demos() -> list:
     """Build few-shot demonstrations for the Logistics domain.
 
-    Loads demonstrations from ``src/bdi_llm/data/logistics_demos.yaml``.
+    Loads demonstrations from ``src/bdi_llm/data/logistics_demos.yaml``. The
+    parsed store is built once per process; each planner gets its own list.
     """
+    return list(_logistics_demo_store())
+
+
+@functools.cache
+def _logistics_demo_store() -> tuple:
     from ..schemas import ActionNode, BDIPlan, DependencyEdge
 
     try:
         import dspy
     except ImportError:
-        return []
+        return ()
 
     data_path = Path(__file__).parent.parent / "data" / "logistics_demos.yaml"
 
     if not data_path.exists():
-        return []
+        return ()
 
     with open(data_path) as f:
         data = yaml.safe_load(f)
@@ -651,4 +658,4 @@ def _build_logistics_demos() -> list:
             ).with_inputs("beliefs", "desire")
         )
 
-    return demos
+    return tuple(demos)
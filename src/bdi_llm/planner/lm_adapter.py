@@ -1,13 +1,18 @@
 """DSPy LM adapter for OpenAI Responses API or Chat Completions API."""
 
 import json
+import random
 import time
 from typing import Any
 
 import dspy
 import requests
+from dspy.clients.cache import request_cache
 from requests.adapters import HTTPAdapter
 
+# 4xx statuses worth retrying: request timeout, conflict, rate limit
+_RETRYABLE_CLIENT_STATUSES = {408, 409, 429}
+
 
 class _MockMessage:
     def __init__(self, content):
@@ -55,17 +60,21 @@ class ResponsesAPILM(dspy.BaseLM):
         chat_template_kwargs: dict[str, Any] | None = None,
         seed: int | None = None,
         temperature: float = 1.0,
+        cache: bool = True,
     ):
         """
         Args:
             use_chat_completions: If True, use /v1/chat/completions endpoint (NVIDIA).
                                   If False, use /v1/responses endpoint (infiniteai).
+            cache: Serve repeated identical requests from DSPy's memory/disk
+                   cache, as ``dspy.LM`` does.
         """
         super().__init__(
             model=model,
             model_type="chat",
             temperature=temperature,
             max_tokens=max_tokens,
+            cache=cache,
         )
         self.api_key = api_key
         self.api_base = api_base.rstrip("/")
@@ -154,7 +163,7 @@ class ResponsesAPILM(dspy.BaseLM):
         message = error.get("message", "unknown error") if isinstance(error, dict) else str(error)
         raise RuntimeError(f"ResponsesAPI error: {code} - {message}")
 
-    def _call_once_chat_completions(self, messages):
+    def _call_once_chat_completions(self, messages, max_tokens=None):
         """Call Chat Completions API (NVIDIA style) with streaming."""
         url = f"{self.api_base}/chat/completions"
         headers = {
@@ -167,7 +176,7 @@ class ResponsesAPILM(dspy.BaseLM):
         payload = {
             "model": self.model,
             "messages": chat_messages,
-            "max_tokens": self.kwargs.get("max_tokens", 16000),
+            "max_tokens": max_tokens or self.kwargs.get("max_tokens", 16000),
             "temperature": self.kwargs.get("temperature", 1.0),
             "top_p": 1.0,
             "stream": True,
@@ -222,7 +231,7 @@ class ResponsesAPILM(dspy.BaseLM):
         self._last_output_text = "".join(content_parts)
         return self._last_output_text
 
-    def _call_once(self, input_items, instructions=None):
+    def _call_once(self, input_items, instructions=None, max_tokens=None):
         """Call Responses API (infiniteai style)."""
         url = f"{self.api_base}/responses"
         headers = {
@@ -233,7 +242,7 @@ class ResponsesAPILM(dspy.BaseLM):
             "model": self.model,
             "input": input_items,
             "reasoning": {"effort": self.reasoning_effort},
-            "max_output_tokens": self.kwargs.get("max_tokens", 16000),
+            "max_output_tokens": max_tokens or self.kwargs.get("max_tokens", 16000),
             "store": False,
             "stream": False,
         }
@@ -278,27 +287,68 @@ class ResponsesAPILM(dspy.BaseLM):
     def forward(self, prompt=None, messages=None, **kwargs):
         if prompt is not None:
             messages = [{"role": "user", "content": prompt}]
+        # A per-call ceiling (e.g. Config.DOMAIN_MAX_TOKENS) bounds this request's
+        # output, reasoning included, as dspy.LM does for per-call kwargs
+        max_tokens = kwargs.get("max_tokens")
+
+        if self.cache:
+            request = self._cache_request(messages, max_tokens)
+            if kwargs.get("rollout_id") is not None:
+                # Distinct rollouts of the same prompt are separate cache entries, as in dspy.LM
+                request["rollout_id"] = kwargs["rollout_id"]
+            text, reasoning = self._cached_complete(request=request)
+            # Restore the audit fields a cache hit would otherwise leave stale
+            self._last_output_text = text
+            self._last_reasoning_content = reasoning
+        else:
+            text = self._complete(messages, max_tokens)
+        return _MockChatCompletion(text, self.model)
 
+    def _cache_request(self, messages, max_tokens: int | None = None) -> dict[str, Any]:
+        """Everything that determines the completion (credentials excluded)."""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "use_chat_completions": self.use_chat_completions,
+            "reasoning_effort": self.reasoning_effort,
+            "max_tokens": max_tokens or self.kwargs.get("max_tokens"),
+            "temperature": self.kwargs.get("temperature"),
+            "seed": self.seed,
+            "chat_template_kwargs": self.chat_template_kwargs,
+        }
+
+    @request_cache(cache_arg_name="request")
+    def _cached_complete(self, request: dict[str, Any]) -> tuple[str, str | None]:
+        """``_complete`` through ``dspy.cache``; failures are raised, never cached."""
+        text = self._complete(request["messages"], request["max_tokens"])
+        return text, self._last_reasoning_content
+
+    def _complete(self, messages, max_tokens: int | None = None) -> str:
         if self.use_chat_completions:
             # Use Chat Completions API (NVIDIA style)
-            last_err = None
-            for attempt in range(self.num_retries):
-                try:
-                    text = self._call_once_chat_completions(messages)
-                    return _MockChatCompletion(text, self.model)
-                except Exception as e:
-                    last_err = e
-                    time.sleep(2**attempt)
-            raise last_err
-        else:
-            # Use Responses API (infiniteai style)
-            input_items, instructions = self._messages_to_input(messages or [])
-            last_err = None
-            for attempt in range(self.num_retries):
-                try:
-                    text = self._call_once(input_items, instructions)
-                    return _MockChatCompletion(text, self.model)
-                except Exception as e:
-                    last_err = e
-                    time.sleep(2**attempt)
-            raise last_err
+            return self._with_retries(self._call_once_chat_completions, messages, max_tokens)
+        # Use Responses API (infiniteai style)
+        input_items, instructions = self._messages_to_input(messages or [])
+        return self._with_retries(self._call_once, input_items, instructions, max_tokens)
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """False for client errors (4xx other than 408/409/429) that a retry would repeat."""
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            return not (400 <= status < 500) or status in _RETRYABLE_CLIENT_STATUSES
+        return True
+
+    def _with_retries(self, call, *args) -> str:
+        """Run ``call``, retrying transient failures with exponential backoff plus jitter.
+
+        No sleep follows the final attempt.
+        """
+        for attempt in range(self.num_retries):
+            try:
+                return call(*args)
+            except Exception as e:
+                if attempt == self.num_retries - 1 or not self._is_transient(e):
+                    raise
+            time.sleep(2**attempt + random.uniform(0, 1))
+        raise RuntimeError("ResponsesAPILM requires num_retries >= 1")
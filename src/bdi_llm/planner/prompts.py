@@ -1,5 +1,12 @@
 """Shared prompt constants used across DSPy Signatures for BDI planning."""
 
+import re
+
+# Lines made only of box-drawing rules, and the │ ... │ borders of boxed titles
+_BOX_RULE_LINE = re.compile(r"^[ \t]*[═─┌┐└┘├┤┬┴┼]+[ \t]*$\n?", re.MULTILINE)
+_BOX_BORDER = re.compile(r"^([ \t]*)│[ \t]?(.*?)[ \t]*│[ \t]*$", re.MULTILINE)
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
 _GRAPH_STRUCTURE_COMMON = """    CRITICAL GRAPH STRUCTURE REQUIREMENTS:
 
     1. **CONNECTIVITY**: The plan graph MUST be weakly connected.
@@ -65,3 +72,16 @@ _LOGICOT_PROTOCOL_DETAILED = """    **Step 1: Identify Goal**
     - If ANY precondition NOT satisfied → Find prerequisite actions first"""
 
 _REMINDER = "    REMEMBER: State tracking is NOT optional. It is MANDATORY for correct planning."
+
+
+def compress_instructions(text: str) -> str:
+    """Drop box-drawing decoration from prompt instructions, keeping every word.
+
+    Removes rule lines (═══, ┌───┐ ...), unwraps ``│ title │`` borders,
+    strips trailing whitespace and collapses runs of blank lines. Used when
+    ``Config.COMPRESS_PROMPTS`` is on to cut input tokens per request.
+    """
+    text = _BOX_RULE_LINE.sub("", text)
+    text = _BOX_BORDER.sub(r"\1\2", text)
+    text = _TRAILING_SPACE.sub("", text)
+    return re.sub(r"\n{3,}", "\n\n", text)
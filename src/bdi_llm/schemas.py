@@ -2,7 +2,7 @@ import json
 import logging
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 logger = logging.getLogger(__name__)
 
@@ -47,20 +47,68 @@ class BDIPlan(BaseModel):
         description="List of execution dependencies",
     )
 
+    # (nodes, edges, graph) snapshot from the last to_networkx() call
+    _graph_cache: tuple | None = PrivateAttr(default=None)
+
+    def __eq__(self, other: object) -> bool:
+        # pydantic also compares private attributes; the memoised graph must not
+        # make two otherwise identical plans unequal.
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
     def to_networkx(self):
-        """Helper to convert Pydantic model to NetworkX DiGraph"""
+        """Helper to convert Pydantic model to NetworkX DiGraph.
+
+        The graph is memoised and rebuilt only when ``nodes``/``edges`` change
+        (reassignment or list mutation). The returned graph is shared between
+        calls, so callers that modify it must work on ``G.copy()``; callers that
+        edit a node or edge in place must call ``invalidate_graph_cache()``.
+        """
+        cached = self._graph_cache
+        if (
+            cached is not None
+            and len(cached[0]) == len(self.nodes)
+            and len(cached[1]) == len(self.edges)
+            and all(a is b for a, b in zip(cached[0], self.nodes, strict=True))
+            and all(a is b for a, b in zip(cached[1], self.edges, strict=True))
+        ):
+            return cached[2]
+
+        G = self._build_networkx()
+        self._graph_cache = (tuple(self.nodes), tuple(self.edges), G)
+        return G
+
+    def prime_graph_cache(self, G) -> None:
+        """Install an already-built graph of this plan as the memoised one.
+
+        For producers such as ``PlanRepairer`` that maintain the graph
+        alongside the plan; *G* must equal what ``to_networkx()`` would build.
+        """
+        self._graph_cache = (tuple(self.nodes), tuple(self.edges), G)
+
+    def invalidate_graph_cache(self) -> None:
+        """Drop the memoised graph after editing nodes or edges in place."""
+        self._graph_cache = None
+
+    def _build_networkx(self):
         import networkx as nx
 
         G = nx.DiGraph()
         declared_node_ids = {node.id for node in self.nodes}
-        for node in self.nodes:
-            G.add_node(node.id, _declared=True, **node.model_dump())
-        for edge in self.edges:
-            if edge.source not in declared_node_ids:
-                G.add_node(edge.source, _declared=False)
-            if edge.target not in declared_node_ids:
-                G.add_node(edge.target, _declared=False)
-            G.add_edge(edge.source, edge.target, relationship=edge.relationship)
+        # Bulk inserts from pre-built lists; node and adjacency order match
+        # adding each node, then each edge's undeclared endpoints and the edge.
+        G.add_nodes_from([(node.id, {"_declared": True, **node.model_dump()}) for node in self.nodes])
+        G.add_nodes_from(
+            [
+                endpoint
+                for edge in self.edges
+                for endpoint in (edge.source, edge.target)
+                if endpoint not in declared_node_ids
+            ],
+            _declared=False,
+        )
+        G.add_edges_from([(edge.source, edge.target, {"relationship": edge.relationship}) for edge in self.edges])
         return G
 
     @classmethod
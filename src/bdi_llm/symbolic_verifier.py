@@ -14,6 +14,8 @@ Date: 2026-02-03
 
 import os
 import re
+import shutil
+import tempfile
 from typing import Any
 
 from .config import Config
@@ -32,6 +34,14 @@ class PDDLSymbolicVerifier:
     - Type constraints met
 
     Low-level VAL subprocess management is delegated to :mod:`val_runner`.
+
+    Can be used as a context manager to reuse one scratch plan file across
+    repeated ``verify_plan`` calls (e.g. a VAL repair loop) instead of
+    creating and deleting a temporary file per call::
+
+        with PDDLSymbolicVerifier() as verifier:
+            for actions in candidates:
+                verifier.verify_plan(domain_file, problem_file, actions)
     """
 
     def __init__(self, val_path: str = None):
@@ -44,6 +54,7 @@ class PDDLSymbolicVerifier:
             val_path = Config.VAL_VALIDATOR_PATH
 
         self.val_path = str(val_path)
+        self._scratch_dir: str | None = None
 
         # Verify VAL exists
         if not os.path.exists(self.val_path):
@@ -51,6 +62,15 @@ class PDDLSymbolicVerifier:
                 f"VAL validator not found at: {self.val_path}\nPlease ensure PlanBench is properly installed."
             )
 
+    def __enter__(self) -> "PDDLSymbolicVerifier":
+        self._scratch_dir = tempfile.mkdtemp(prefix="bdi_val_")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._scratch_dir is not None:
+            shutil.rmtree(self._scratch_dir, ignore_errors=True)
+            self._scratch_dir = None
+
     def verify_plan(
         self,
         domain_file: str,
@@ -82,6 +102,7 @@ class PDDLSymbolicVerifier:
             ... )
             >>> print(f"Valid: {is_valid}, Errors: {errors}")
         """
+        plan_file = os.path.join(self._scratch_dir, "plan.pddl") if self._scratch_dir else None
         return run_val(
             self.val_path,
             domain_file,
@@ -89,6 +110,7 @@ class PDDLSymbolicVerifier:
             plan_actions,
             check_goal=check_goal,
             verbose=verbose,
+            plan_file=plan_file,
         )
 
 
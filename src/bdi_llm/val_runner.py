@@ -14,6 +14,9 @@ import re
 import subprocess
 import tempfile
 
+# Error reported for a plan with no actions (VAL is not invoked)
+EMPTY_PLAN_ERROR = "Empty plan - no actions to verify"
+
 # ---------------------------------------------------------------------------
 # Compiled regex patterns shared by all extraction helpers
 # ---------------------------------------------------------------------------
@@ -36,27 +39,35 @@ _RE_TYPE_ERROR = re.compile(r"Type error: (.+)")
 # ---------------------------------------------------------------------------
 
 
+def _formatted_plan_lines(actions: list[str]):
+    """Yield one parenthesised PDDL action per line."""
+    for action in actions:
+        action_str = action.strip()
+        if not action_str.startswith("("):
+            action_str = f"({action_str})"
+        yield f"{action_str}\n"
+
+
+def write_plan_file(actions: list[str], path: str) -> str:
+    """Write *actions* as a PDDL plan file at *path* (overwriting) and return it."""
+    with open(path, "w") as f:
+        f.writelines(_formatted_plan_lines(actions))
+    return path
+
+
 def create_plan_file(actions: list[str]) -> str:
     """Create a temporary PDDL plan file and return its path.
 
     Each action is formatted to be surrounded by parentheses if necessary.
     The caller is responsible for deleting the file after use.
     """
-
-    def _formatted(action_list):
-        for action in action_list:
-            action_str = action.strip()
-            if not action_str.startswith("("):
-                action_str = f"({action_str})"
-            yield f"{action_str}\n"
-
     with tempfile.NamedTemporaryFile(
         mode="w",
         suffix=".pddl",
         delete=False,
         prefix="bdi_plan_",
     ) as f:
-        f.writelines(_formatted(actions))
+        f.writelines(_formatted_plan_lines(actions))
         return f.name
 
 
@@ -74,6 +85,7 @@ def run_val(
     check_goal: bool = True,
     verbose: bool = False,
     timeout: int = 30,
+    plan_file: str | None = None,
 ) -> tuple[bool, list[str]]:
     """Run the VAL validator on a set of PDDL actions and return ``(is_valid, errors)``.
 
@@ -91,14 +103,21 @@ def run_val(
             "executed but goal not satisfied" as success.
         verbose: If *True*, append the full VAL output to the error list.
         timeout: Maximum seconds to wait for VAL.
+        plan_file: Optional caller-owned path to (re)write the plan to. When
+            given, the file is overwritten and left in place for reuse;
+            otherwise a temporary file is created and deleted.
 
     Returns:
         ``(is_valid, error_messages)``
     """
     if not plan_actions:
-        return False, ["Empty plan - no actions to verify"]
+        return False, [EMPTY_PLAN_ERROR]
 
-    plan_file = create_plan_file(plan_actions)
+    owns_plan_file = plan_file is None
+    if owns_plan_file:
+        plan_file = create_plan_file(plan_actions)
+    else:
+        write_plan_file(plan_actions, plan_file)
 
     try:
         result = subprocess.run(
@@ -137,7 +156,7 @@ def run_val(
         return False, [f"VAL execution error: {str(e)}"]
 
     finally:
-        if os.path.exists(plan_file):
+        if owns_plan_file and os.path.exists(plan_file):
             os.unlink(plan_file)
 
 
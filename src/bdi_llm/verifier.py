@@ -1,7 +1,14 @@
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
 import networkx as nx
 
+# Verdicts of recently verified NetworkX graphs, keyed by their content
+_VERDICT_CACHE_SIZE = 128
+_verdict_cache: OrderedDict[tuple, tuple[bool, tuple[str, ...], tuple[str, ...], tuple[str, ...]]] = OrderedDict()
+_verdict_cache_lock = threading.Lock()
+
 
 @dataclass
 class VerificationResult:
@@ -80,13 +87,53 @@ class PlanVerifier:
         Soft warnings (proceed to Layer 2):
         - Disconnected components: May be valid parallel subplans
         """
+        return PlanVerifier.verify_and_sort(graph)[0]
+
+    @staticmethod
+    def verify_and_sort(graph: nx.DiGraph) -> tuple[VerificationResult, list[str]]:
+        """
+        Runs ``verify`` and ``topological_sort`` from one traversal.
+
+        The cycle check is answered by attempting the topological sort itself,
+        so callers that need both the verdict and the execution order do not
+        walk the graph twice.
+
+        Returns:
+            ``(result, order)`` where ``order`` is what ``topological_sort``
+            returns for the same graph (empty if it has cycles).
+        """
+        # Node order, ``_declared`` flags and successor order fully determine the
+        # result (including the order and the reported cycle), so graphs with the
+        # same key share a verdict. Hashing them is a few times cheaper than the
+        # checks below, and ``forward`` re-verifies the same graph during repair.
+        key = (tuple(graph.nodes(data="_declared")), tuple(graph.edges()))
+        with _verdict_cache_lock:
+            cached = _verdict_cache.get(key)
+            if cached is not None:
+                _verdict_cache.move_to_end(key)
+        if cached is None:
+            result, order = PlanVerifier._verify_networkx(graph)
+            cached = (result.is_valid, tuple(result.hard_errors), tuple(result.warnings), tuple(order))
+            with _verdict_cache_lock:
+                _verdict_cache[key] = cached
+                while len(_verdict_cache) > _VERDICT_CACHE_SIZE:
+                    _verdict_cache.popitem(last=False)
+
+        is_valid, hard_errors, warnings, order = cached
+        return VerificationResult(is_valid=is_valid, hard_errors=list(hard_errors), warnings=list(warnings)), list(
+            order
+        )
+
+    @staticmethod
+    def _verify_networkx(graph: nx.DiGraph) -> tuple[VerificationResult, list[str]]:
+        """Uncached ``verify_and_sort`` on a ``networkx.DiGraph``."""
         hard_errors = []
         warnings = []
 
         # Check 1: Empty Graph (HARD)
         if graph.number_of_nodes() == 0:
             hard_errors.append("Plan is empty (no actions generated).")
-            return VerificationResult(is_valid=False, hard_errors=hard_errors, warnings=warnings)
+            return VerificationResult(is_valid=False, hard_errors=hard_errors, warnings=warnings), []
 
         # Check 2: Dangling dependency endpoints (HARD)
         # BDIPlan.to_networkx marks endpoint nodes that NetworkX had to create
@@ -103,10 +150,12 @@ class PlanVerifier:
 
         # Check 4: Cycles (HARD)
         # A plan must be a Directed Acyclic Graph (DAG) to have valid execution order.
+        order: list[str] = []
         try:
-            if not nx.is_directed_acyclic_graph(graph):
-                cycle_edges = nx.find_cycle(graph)
-                cycle_nodes = [u for u, v in cycle_edges]
+            try:
+                order = list(nx.topological_sort(graph))
+            except nx.NetworkXUnfeasible:
+                cycle_nodes = PlanVerifier._find_cycle_nodes(graph)
                 cycle_str = " -> ".join(map(str, cycle_nodes))
                 hard_errors.append(f"Cycle detected: {cycle_str}")
         except Exception as e:
@@ -118,7 +167,29 @@ class PlanVerifier:
         # guarantees node existence.
 
         is_valid = len(hard_errors) == 0
-        return VerificationResult(is_valid=is_valid, hard_errors=hard_errors, warnings=warnings)
+        return VerificationResult(is_valid=is_valid, hard_errors=hard_errors, warnings=warnings), order
+
+    @staticmethod
+    def _find_cycle_nodes(graph: nx.DiGraph) -> list[str]:
+        """Nodes of one cycle, in order, from the first cyclic strongly connected component.
+
+        Every node of a non-trivial SCC has a successor inside it, so walking
+        such successors must revisit a node; the loop closed there is a cycle.
+        Cheaper than ``nx.find_cycle``, which re-runs an edge DFS over the
+        whole graph.
+        """
+        for component in nx.strongly_connected_components(graph):
+            node = next(iter(component))
+            if len(component) == 1 and not graph.has_edge(node, node):
+                continue
+            position: dict[str, int] = {}
+            path: list[str] = []
+            while node not in position:
+                position[node] = len(path)
+                path.append(node)
+                node = next(v for v in graph.successors(node) if v in component)
+            return path[position[node] :]
+        return []
 
     @staticmethod
     def topological_sort(graph: nx.DiGraph) -> list[str]:
@@ -58,10 +58,11 @@ class PlanVisualizer:
         G = plan.to_networkx()
 
         # Verify and get execution order
-        struct_result = PlanVerifier.verify(G)
+        struct_result, execution_order = PlanVerifier.verify_and_sort(G)
         is_valid = struct_result.is_valid
         has_blocking_errors = struct_result.should_block_execution
-        execution_order = PlanVerifier.topological_sort(G) if not has_blocking_errors else []
+        if has_blocking_errors:
+            execution_order = []
 
         # Create figure
         fig, ax = plt.subplots(figsize=figsize)
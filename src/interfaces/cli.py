@@ -33,8 +33,8 @@ def main():
     print("Generating Plan...")
 
     try:
-        # Run the planner
-        # dspy.Suggest/Assert will automatically retry if validation fails
+        # Run the planner (single generation: invalid plans come back for
+        # external repair; unusable output raises ValueError)
         response = planner(beliefs=beliefs, desire=desire)
         final_plan = response.plan
 
@@ -51,11 +51,12 @@ def main():
 
         # Verify final result
         G = final_plan.to_networkx()
-        print(f"\nFinal Graph Valid? {PlanVerifier.verify(G)[0]}")
+        result, order = PlanVerifier.verify_and_sort(G)
+        print(f"\nFinal Graph Valid? {result.is_valid}")
 
-        if PlanVerifier.verify(G)[0]:
+        if result.is_valid:
             print("\nExecution Order:")
-            print(" -> ".join(PlanVerifier.topological_sort(G)))
+            print(" -> ".join(order))
 
     except ValueError as e:
         print(f"\n❌ Planning Failed: {e}")
@@ -0,0 +1,75 @@
+"""Tests for the in-flight LLM request gate in api_budget."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from src.bdi_llm import api_budget
+
+
+def test_api_call_slot_caps_concurrent_requests():
+    original = api_budget.API_SEMAPHORE
+    api_budget.set_api_concurrency(2)
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_request():
+        nonlocal in_flight, peak
+        with api_budget.api_call_slot():
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+
+    try:
+        threads = [threading.Thread(target=fake_request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        api_budget.API_SEMAPHORE = original
+
+    assert peak == 2
+    assert in_flight == 0
+
+
+def test_api_call_slot_releases_permit_on_error():
+    original = api_budget.API_SEMAPHORE
+    api_budget.set_api_concurrency(1)
+    try:
+        try:
+            with api_budget.api_call_slot():
+                raise RuntimeError("provider error")
+        except RuntimeError:
+            pass
+        assert api_budget.API_SEMAPHORE.acquire(blocking=False)
+        api_budget.API_SEMAPHORE.release()
+    finally:
+        api_budget.API_SEMAPHORE = original
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = api_budget.TokenBucket(rate_per_s=50, burst=2)
+
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(4)]
+    elapsed = time.monotonic() - start
+
+    assert waits[:2] == [0.0, 0.0]
+    assert elapsed >= 2 / 50 * 0.9
+
+
+def test_set_api_qps_disables_limiter_for_non_positive_rate():
+    original = api_budget.API_RATE_LIMITER
+    try:
+        api_budget.set_api_qps(5)
+        assert isinstance(api_budget.API_RATE_LIMITER, api_budget.TokenBucket)
+        api_budget.set_api_qps(0)
+        assert api_budget.API_RATE_LIMITER is None
+    finally:
+        api_budget.API_RATE_LIMITER = original
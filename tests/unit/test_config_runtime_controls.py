@@ -8,9 +8,82 @@ import importlib
 def test_config_reads_seed_and_thinking_flags(monkeypatch):
     monkeypatch.setenv("LLM_SEED", "7")
     monkeypatch.setenv("LLM_ENABLE_THINKING", "false")
+    monkeypatch.setenv("BDI_PLAN_CACHE_ENABLED", "1")
 
     config_module = importlib.import_module("src.bdi_llm.config")
     config_module = importlib.reload(config_module)
 
     assert config_module.Config.SEED == 7
     assert config_module.Config.ENABLE_THINKING is False
+    assert config_module.Config.PLAN_CACHE_ENABLED is True
+
+
+def test_prompt_cache_points_only_for_anthropic_models(monkeypatch):
+    from src.bdi_llm.planner import dspy_config
+
+    monkeypatch.setattr(dspy_config.Config, "PROMPT_CACHE_ENABLED", True)
+    assert dspy_config._prompt_cache_injection_points("openai/claude-opus-4") == [
+        {"location": "message", "role": "system"}
+    ]
+    assert dspy_config._prompt_cache_injection_points("openai/gpt-4o") is None
+
+    monkeypatch.setattr(dspy_config.Config, "PROMPT_CACHE_ENABLED", False)
+    assert dspy_config._prompt_cache_injection_points("anthropic/claude-3-5-sonnet") is None
+
+
+def test_configure_dspy_runs_once_across_threads(monkeypatch):
+    import threading
+    import time
+
+    from src.bdi_llm.planner import dspy_config
+
+    calls = []
+
+    def fake_configure():
+        calls.append(threading.get_ident())
+        time.sleep(0.02)
+        dspy_config._dspy_configured = True
+
+    monkeypatch.setattr(dspy_config, "_dspy_configured", False)
+    monkeypatch.setattr(dspy_config, "_configure_dspy", fake_configure)
+
+    threads = [threading.Thread(target=dspy_config.configure_dspy) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+
+
+def test_system_prompt_caching_adapter_matches_chat_adapter():
+    import dspy
+
+    from src.bdi_llm.planner import dspy_config
+    from src.bdi_llm.planner.signatures import GeneratePlan
+
+    adapter = dspy_config._SystemPromptCachingChatAdapter()
+    inputs = {"beliefs": "a is clear", "desire": "a on b"}
+
+    first = adapter.format(GeneratePlan, demos=[], inputs=inputs)
+    second = adapter.format(GeneratePlan, demos=[], inputs={**inputs, "desire": "b on a"})
+
+    assert first == dspy.ChatAdapter().format(GeneratePlan, demos=[], inputs=inputs)
+    assert second[0] == first[0]
+    assert adapter._render_system_message.cache_info().hits == 1
+
+
+def test_provider_credentials_follow_litellm_provider_prefix(monkeypatch):
+    from src.bdi_llm.planner import dspy_config
+
+    monkeypatch.setattr(dspy_config.Config, "OPENAI_API_BASE", "https://gateway.example/v1")
+    both = {"openai": "sk-openai", "google": "g-key"}
+    openai_only = {"openai": "sk-openai", "google": None}
+
+    assert dspy_config._provider_credentials("gemini/gemini-2.0-flash", both) == {"api_key": "g-key"}
+    assert dspy_config._provider_credentials("gemini/gemini-2.0-flash", openai_only) == {}
+    assert dspy_config._provider_credentials("openai/gemini-2.5-pro", both) == {
+        "api_key": "sk-openai",
+        "api_base": "https://gateway.example/v1",
+    }
+    assert dspy_config._provider_credentials("vertex_ai/gemini-2.0-flash", both) == {}
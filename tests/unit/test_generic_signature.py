@@ -53,6 +53,127 @@ class TestIsGenericFlag:
         assert planner._is_generic is True
 
 
+class TestExplicitLM:
+    def test_explicit_lm_skips_global_configuration(self, monkeypatch):
+        from src.bdi_llm.planner import bdi_engine
+
+        def fail():
+            raise AssertionError("configure_dspy should not run when an LM is supplied")
+
+        monkeypatch.setattr(bdi_engine, "configure_dspy", fail)
+        lm = object()
+
+        planner = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld", lm=lm)
+
+        assert planner.named_predictors()
+        assert all(predictor.lm is lm for _, predictor in planner.named_predictors())
+
+
+class TestCandidateGeneration:
+    def test_first_valid_candidate_wins(self, monkeypatch):
+        import threading
+        import time
+
+        import dspy
+
+        from src.bdi_llm.planner.bdi_engine import BDIPlanner
+        from src.bdi_llm.schemas import ActionNode, BDIPlan, DependencyEdge
+
+        nodes = [
+            ActionNode(id="s1", action_type="pick-up", params={"block": "a"}, description="Pick up a"),
+            ActionNode(id="s2", action_type="stack", params={"block": "a", "target": "b"}, description="Stack"),
+        ]
+        valid = BDIPlan(goal_description="valid", nodes=nodes, edges=[DependencyEdge(source="s1", target="s2")])
+        cyclic = BDIPlan(
+            goal_description="cyclic",
+            nodes=nodes,
+            edges=[DependencyEdge(source="s1", target="s2"), DependencyEdge(source="s2", target="s1")],
+        )
+        rollouts = []
+        lock = threading.Lock()
+
+        def fake_generate(beliefs, desire, domain_context=None, rollout_id=None):
+            with lock:
+                rollouts.append(rollout_id)
+            if rollout_id is None:
+                time.sleep(0.05)
+                return dspy.Prediction(plan=cyclic)
+            return dspy.Prediction(plan=valid)
+
+        planner = BDIPlanner(auto_repair=False, domain="blocksworld", lm=object(), num_candidates=3)
+        monkeypatch.setattr(planner, "generate_plan", fake_generate)
+
+        pred = planner(beliefs="a and b are clear", desire="a on b")
+
+        assert pred.plan.goal_description == "valid"
+        # Candidates still queued when a valid plan arrives are cancelled
+        assert len(set(rollouts)) == len(rollouts)
+        assert set(rollouts) <= {None, 1, 2}
+
+    def test_candidates_see_callers_dspy_context(self, monkeypatch):
+        import threading
+
+        import dspy
+
+        from src.bdi_llm.planner.bdi_engine import BDIPlanner
+
+        seen = []
+        lock = threading.Lock()
+
+        def fake_generate(beliefs, desire, domain_context=None, rollout_id=None):
+            with lock:
+                seen.append(dspy.settings.lm)
+            return dspy.Prediction(plan=None)
+
+        planner = BDIPlanner(auto_repair=False, domain="blocksworld", lm=object(), num_candidates=2)
+        monkeypatch.setattr(planner, "generate_plan", fake_generate)
+        scoped_lm = object()
+
+        with dspy.context(lm=scoped_lm):
+            planner._generate_candidates("b", "d", None)
+
+        assert seen and all(lm is scoped_lm for lm in seen)
+
+
+class TestDomainMaxTokens:
+    def test_domain_ceiling_is_passed_per_call(self, monkeypatch):
+        import dspy
+
+        from src.bdi_llm.planner import bdi_engine
+
+        calls = []
+
+        def fake_program(**kwargs):
+            calls.append(kwargs.get("config"))
+            return dspy.Prediction(plan=None)
+
+        planner = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld", lm=object())
+        monkeypatch.setattr(planner, "_generate_program", fake_program)
+
+        monkeypatch.setattr(bdi_engine.Config, "DOMAIN_MAX_TOKENS", {"logistics": 3000})
+        planner.generate_plan(beliefs="b", desire="d")
+        monkeypatch.setattr(bdi_engine.Config, "DOMAIN_MAX_TOKENS", {"blocksworld": 1500})
+        planner.generate_plan(beliefs="b", desire="d", rollout_id=2)
+
+        assert calls == [None, {"rollout_id": 2, "max_tokens": 1500}]
+
+
+class TestPromptCompression:
+    def test_compressed_prompt_drops_box_drawing_only(self, monkeypatch):
+        import re
+
+        from src.bdi_llm.planner import bdi_engine
+
+        monkeypatch.setattr(bdi_engine.Config, "COMPRESS_PROMPTS", True)
+        planner = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld", lm=object())
+        signature = planner._generate_program.predict.signature
+
+        assert not re.search("[═─┌┐└┘│]", signature.instructions)
+        assert len(signature.instructions) < len(GeneratePlan.instructions)
+        assert re.findall(r"\w+", signature.instructions) == re.findall(r"\w+", GeneratePlan.instructions)
+        assert set(signature.output_fields) == {"reasoning", "plan"}
+
+
 # ---------------------------------------------------------------------------
 # generate_plan() wrapper — ctx missing → ValueError
 # ---------------------------------------------------------------------------
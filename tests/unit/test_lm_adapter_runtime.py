@@ -58,3 +58,98 @@ def test_chat_completions_payload_includes_seed_and_temperature(monkeypatch):
     assert result == "hello"
     assert recorded["payload"]["seed"] == 42
     assert recorded["payload"]["temperature"] == 0.0
+
+
+def test_forward_serves_repeated_requests_from_dspy_cache(monkeypatch):
+    import dspy
+    from dspy.clients.cache import Cache
+
+    monkeypatch.setattr(dspy, "cache", Cache(enable_disk_cache=False, enable_memory_cache=True, disk_cache_dir=None))
+    posts: list[object] = []
+
+    def fake_post(_url: str, json: object | None = None, **_kwargs: object) -> _FakeResponse:
+        posts.append(json)
+        return _FakeResponse()
+
+    lm = ResponsesAPILM(
+        model="glm47flash",
+        api_key="EMPTY",
+        api_base="http://localhost:8000/v1",
+        use_chat_completions=True,
+    )
+    monkeypatch.setattr(lm._session, "post", fake_post)
+    messages = [{"role": "user", "content": "hello"}]
+
+    first = lm.forward(messages=messages)
+    lm._last_output_text = None
+    second = lm.forward(messages=messages)
+    restored_output = lm._last_output_text
+    lm.forward(messages=[{"role": "user", "content": "different"}])
+
+    assert first.choices[0].message.content == second.choices[0].message.content == "hello"
+    assert restored_output == "hello"
+    assert len(posts) == 2
+
+
+def test_retries_transient_errors_but_not_client_errors(monkeypatch):
+    import pytest
+    import requests
+
+    from src.bdi_llm.planner import lm_adapter
+
+    sleeps: list[float] = []
+    monkeypatch.setattr(lm_adapter.time, "sleep", sleeps.append)
+    lm = ResponsesAPILM(model="m", api_key="EMPTY", api_base="http://localhost:8000/v1", num_retries=3)
+
+    def http_error(status: int) -> requests.HTTPError:
+        response = requests.Response()
+        response.status_code = status
+        return requests.HTTPError(response=response)
+
+    outcomes = [http_error(503), requests.ConnectionError(), "ok"]
+
+    def flaky() -> str:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert lm._with_retries(flaky) == "ok"
+    assert len(sleeps) == 2
+
+    calls: list[int] = []
+
+    def bad_request() -> str:
+        calls.append(1)
+        raise http_error(400)
+
+    sleeps.clear()
+    with pytest.raises(requests.HTTPError):
+        lm._with_retries(bad_request)
+    assert calls == [1]
+    assert sleeps == []
+
+
+def test_per_call_max_tokens_overrides_constructor_ceiling(monkeypatch):
+    payloads: list[dict] = []
+
+    def fake_post(_url: str, json: dict | None = None, **_kwargs: object) -> _FakeResponse:
+        payloads.append(json)
+        return _FakeResponse()
+
+    lm = ResponsesAPILM(
+        model="glm47flash",
+        api_key="EMPTY",
+        api_base="http://localhost:8000/v1",
+        use_chat_completions=True,
+        max_tokens=8000,
+        cache=False,
+    )
+    monkeypatch.setattr(lm._session, "post", fake_post)
+    messages = [{"role": "user", "content": "hello"}]
+
+    lm.forward(messages=messages)
+    lm.forward(messages=messages, max_tokens=1500)
+
+    assert [p["max_tokens"] for p in payloads] == [8000, 1500]
+    assert lm._cache_request(messages, 1500)["max_tokens"] == 1500
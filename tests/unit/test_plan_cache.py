@@ -0,0 +1,208 @@
+"""Tests for the verified-plan cache."""
+
+from bdi_llm.plan_cache import NullPlanCache, PlanCache
+from bdi_llm.schemas import ActionNode, BDIPlan, DependencyEdge
+
+
+def _plan() -> BDIPlan:
+    return BDIPlan(
+        goal_description="Stack a on b",
+        nodes=[
+            ActionNode(id="s1", action_type="pick-up", params={"block": "a"}, description="Pick up a"),
+            ActionNode(id="s2", action_type="stack", params={"block": "a", "target": "b"}, description="Stack a on b"),
+        ],
+        edges=[DependencyEdge(source="s1", target="s2")],
+    )
+
+
+def test_put_then_get_returns_equal_copy():
+    cache = PlanCache()
+    plan = _plan()
+    cache.put("blocksworld", "a is clear", "a on b", plan)
+
+    cached = cache.get("blocksworld", "a is clear", "a on b")
+
+    assert cached == plan
+    assert cached is not plan
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_key_ignores_whitespace_and_case_only():
+    cache = PlanCache()
+    cache.put("blocksworld", "A is  clear\n", "a on b", _plan())
+
+    assert cache.get("blocksworld", "a is clear", " A ON B ") is not None
+    assert cache.get("blocksworld", "b is clear", "a on b") is None
+    assert cache.get("logistics", "a is clear", "a on b") is None
+
+
+def test_key_includes_domain_context():
+    cache = PlanCache()
+    cache.put("generic", "a is clear", "a on b", _plan(), "(define (domain gripper))")
+
+    assert cache.get("generic", "a is clear", "a on b", "(define (domain gripper))") is not None
+    assert cache.get("generic", "a is clear", "a on b", "(define (domain hanoi))") is None
+    assert cache.get_batch("generic", [("a is clear", "a on b")]) == [None]
+
+
+def test_sqlite_backend_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "plans.db")
+    PlanCache(path=db_path).put("blocksworld", "a is clear", "a on b", _plan())
+
+    reopened = PlanCache(path=db_path)
+
+    assert reopened.get("blocksworld", "a is clear", "a on b") == _plan()
+
+
+def test_lru_evicts_oldest_entry():
+    cache = PlanCache(max_size=1)
+    cache.put("blocksworld", "first", "goal", _plan())
+    cache.put("blocksworld", "second", "goal", _plan())
+
+    assert cache.get("blocksworld", "first", "goal") is None
+    assert cache.get("blocksworld", "second", "goal") is not None
+
+
+def test_null_cache_never_hits():
+    cache = NullPlanCache()
+    cache.put("blocksworld", "a is clear", "a on b", _plan())
+
+    assert cache.get("blocksworld", "a is clear", "a on b") is None
+    assert cache.get_stats()["enabled"] is False
+
+
+def test_get_batch_combines_memory_and_sqlite_hits(tmp_path):
+    db_path = str(tmp_path / "plans.db")
+    PlanCache(path=db_path).put("blocksworld", "on disk", "goal", _plan())
+    cache = PlanCache(path=db_path)
+    cache.put("blocksworld", "in memory", "goal", _plan())
+
+    results = cache.get_batch("blocksworld", [("in memory", "goal"), ("on disk", "goal"), ("unknown", "goal")])
+
+    assert results == [_plan(), _plan(), None]
+    assert cache.get_stats()["hits"] == 2
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_forward_batch_generates_only_cache_misses(monkeypatch):
+    import dspy
+
+    from bdi_llm.planner import bdi_engine
+
+    cache = PlanCache()
+    monkeypatch.setattr(bdi_engine, "get_plan_cache", lambda: cache)
+
+    planner = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld")
+    cache.put("blocksworld", "cached", "goal", _plan(), *planner._cache_scope(None))
+    generated = []
+
+    def fake_generate(beliefs, desire, domain_context, plan_cache):
+        generated.append(beliefs)
+        return dspy.Prediction(plan=_plan(), plan_cache_hit=False)
+
+    monkeypatch.setattr(planner, "_generate_and_verify", fake_generate)
+
+    preds = planner.forward_batch([("fresh 1", "goal"), ("cached", "goal"), ("fresh 2", "goal")], max_workers=2)
+
+    assert sorted(generated) == ["fresh 1", "fresh 2"]
+    assert [p.plan_cache_hit for p in preds] == [False, True, False]
+
+
+def test_aforward_batch_overlaps_cache_misses(monkeypatch):
+    import asyncio
+    import threading
+
+    import dspy
+
+    from bdi_llm.planner import bdi_engine
+
+    cache = PlanCache()
+    monkeypatch.setattr(bdi_engine, "get_plan_cache", lambda: cache)
+
+    planner = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld")
+    cache.put("blocksworld", "cached", "goal", _plan(), *planner._cache_scope(None))
+    both_started = threading.Barrier(2, timeout=5)
+
+    def fake_generate(beliefs, desire, domain_context, plan_cache):
+        both_started.wait()  # deadlocks (and times out) unless the misses run concurrently
+        return dspy.Prediction(plan=_plan(), plan_cache_hit=False)
+
+    monkeypatch.setattr(planner, "_generate_and_verify", fake_generate)
+
+    preds = asyncio.run(planner.aforward_batch([("fresh 1", "goal"), ("cached", "goal"), ("fresh 2", "goal")]))
+
+    assert [p.plan_cache_hit for p in preds] == [False, True, False]
+
+
+def test_aforward_runs_miss_off_the_event_loop(monkeypatch):
+    import asyncio
+    import threading
+
+    import dspy
+
+    from bdi_llm.planner import bdi_engine
+
+    cache = PlanCache()
+    monkeypatch.setattr(bdi_engine, "get_plan_cache", lambda: cache)
+
+    planner = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld")
+    cache.put("blocksworld", "cached", "goal", _plan(), *planner._cache_scope(None))
+    threads = []
+
+    def fake_generate(beliefs, desire, domain_context, plan_cache):
+        threads.append(threading.current_thread())
+        return dspy.Prediction(plan=_plan(), plan_cache_hit=False)
+
+    monkeypatch.setattr(planner, "_generate_and_verify", fake_generate)
+
+    async def run():
+        return await asyncio.gather(
+            planner.acall(beliefs="fresh", desire="goal"),
+            planner.acall(beliefs="cached", desire="goal"),
+        )
+
+    preds = asyncio.run(run())
+
+    assert [p.plan_cache_hit for p in preds] == [False, True]
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_planner_cache_misses_after_model_switch(monkeypatch):
+    from types import SimpleNamespace
+
+    import dspy
+
+    from bdi_llm.planner import bdi_engine
+
+    cache = PlanCache()
+    monkeypatch.setattr(bdi_engine, "get_plan_cache", lambda: cache)
+    old = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld", lm=SimpleNamespace(model="openai/old"))
+    new = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld", lm=SimpleNamespace(model="openai/new"))
+    cache.put("blocksworld", "cached", "goal", _plan(), *old._cache_scope(None))
+    generated = []
+
+    def fake_generate(beliefs, desire, domain_context, plan_cache):
+        generated.append(beliefs)
+        return dspy.Prediction(plan=_plan(), plan_cache_hit=False)
+
+    monkeypatch.setattr(new, "_generate_and_verify", fake_generate)
+
+    assert new(beliefs="cached", desire="goal").plan_cache_hit is False
+    assert generated == ["cached"]
+    assert old(beliefs="cached", desire="goal").plan_cache_hit is True
+
+
+def test_forward_cache_hit_replaces_previous_trace(monkeypatch):
+    from bdi_llm.planner import bdi_engine
+
+    cache = PlanCache()
+    monkeypatch.setattr(bdi_engine, "get_plan_cache", lambda: cache)
+    planner = bdi_engine.BDIPlanner(auto_repair=False, domain="blocksworld")
+    cache.put("blocksworld", "cached", "goal", _plan(), *planner._cache_scope(None))
+    planner._last_generation_trace = {"phase": "generation", "chain_of_thought_text": "previous instance"}
+
+    planner(beliefs="cached", desire="goal")
+
+    trace = planner.get_last_generation_trace()
+    assert trace["plan_cache_hit"] is True
+    assert "chain_of_thought_text" not in trace
@@ -55,6 +55,23 @@ def test_disconnected_plan_gets_repaired_and_validated():
     assert PlanRepairer.VIRTUAL_END in node_ids
 
 
+def test_repaired_plan_reuses_repair_graph_identical_to_rebuild():
+    plan = BDIPlan(
+        goal_description="Three islands",
+        nodes=[ActionNode(id=n, action_type="Test", description=n) for n in ("a", "b", "c", "d")],
+        edges=[DependencyEdge(source="a", target="b")],
+    )
+
+    repaired = PlanRepairer.repair(plan).repaired_plan
+    primed = repaired.to_networkx()
+    repaired.invalidate_graph_cache()
+    rebuilt = repaired.to_networkx()
+
+    assert primed is not rebuilt
+    assert list(primed.nodes(data=True)) == list(rebuilt.nodes(data=True))
+    assert list(primed.edges(data=True)) == list(rebuilt.edges(data=True))
+
+
 def test_parallel_diamond_pattern_is_already_valid():
     plan = BDIPlan(
         goal_description="Parallel tasks",
@@ -97,6 +114,22 @@ def test_canonicalizer_renames_nodes_in_topological_order():
     assert ("action_2", "action_3") in edge_pairs
 
 
+def test_canonicalizing_a_canonical_plan_returns_it_unchanged():
+    plan = BDIPlan(
+        goal_description="Already canonical",
+        nodes=[
+            ActionNode(id="z", action_type="Test", description="Last"),
+            ActionNode(id="a", action_type="Test", description="First"),
+        ],
+        edges=[DependencyEdge(source="a", target="z"), DependencyEdge(source="a", target="z")],
+    )
+
+    canonical = PlanCanonicalizer.canonicalize(plan)
+
+    assert canonical is not plan
+    assert PlanCanonicalizer.canonicalize(canonical) is canonical
+
+
 def test_repair_and_verify_convenience_function_repairs_plan():
     plan = BDIPlan(
         goal_description="Test convenience",
@@ -135,6 +168,24 @@ def test_repair_reuses_existing_virtual_nodes_without_duplication():
     assert repaired_ids.count(PlanRepairer.VIRTUAL_END) == 1
 
 
+def test_preexisting_isolated_virtual_nodes_get_a_single_start_end_edge():
+    plan = BDIPlan(
+        goal_description="Isolated virtual nodes",
+        nodes=[
+            ActionNode(id=node_id, action_type="Test", description=node_id)
+            for node_id in (PlanRepairer.VIRTUAL_START, PlanRepairer.VIRTUAL_END, "a", "b")
+        ],
+        edges=[DependencyEdge(source="a", target="b")],
+    )
+
+    result = PlanRepairer.repair(plan)
+
+    edge_pairs = [(e.source, e.target) for e in result.repaired_plan.edges]
+    assert result.success
+    assert len(edge_pairs) == len(set(edge_pairs))
+    assert (PlanRepairer.VIRTUAL_START, PlanRepairer.VIRTUAL_END) in edge_pairs
+
+
 def test_simple_cycle_is_broken():
     """Test that a simple 3-node cycle A -> B -> C -> A is broken."""
     plan = BDIPlan(
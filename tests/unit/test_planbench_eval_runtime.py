@@ -119,3 +119,159 @@ def test_evaluate_single_problem_uses_current_val_api(tmp_path: Path, monkeypatc
             "check_goal": True,
         }
     ]
+
+
+def _fake_instance_result(instance_file, domain, execution_mode=None, plan_cache_dir=None):
+    stage = {"success": True, "overall_valid": True, "verification_layers": {}}
+    return {
+        "instance_file": instance_file,
+        "instance_name": Path(instance_file).stem,
+        "execution_mode": execution_mode,
+        "success": True,
+        "bdi_initial_result": stage,
+        "bdi_metrics": stage,
+    }
+
+
+def _instances_file(tmp_path: Path, names: list[str]) -> str:
+    instances_file = tmp_path / "instances.txt"
+    instances_file.write_text("".join(f"{tmp_path / name}\n" for name in names))
+    return str(instances_file)
+
+
+def test_run_batch_evaluation_sizes_api_gate_to_worker_count(tmp_path: Path, monkeypatch):
+    from bdi_llm import api_budget  # the module the runner imports, not src.bdi_llm's copy
+    from scripts.evaluation import run_planbench_paperaligned as runner
+
+    monkeypatch.delenv("API_MAX_CONCURRENCY", raising=False)
+    monkeypatch.setattr(api_budget, "API_SEMAPHORE", api_budget.API_SEMAPHORE)
+    monkeypatch.setattr(runner, "MLFLOW_AVAILABLE", False)
+    gate_sizes = []
+
+    def fake_evaluate(*args):
+        gate_sizes.append(api_budget.API_SEMAPHORE._initial_value)
+        return _fake_instance_result(*args)
+
+    monkeypatch.setattr(runner, "evaluate_single_instance", fake_evaluate)
+
+    runner.run_batch_evaluation(
+        "blocksworld",
+        output_dir=str(tmp_path / "out"),
+        parallel=True,
+        max_workers=30,
+        instances_file=_instances_file(tmp_path, ["instance-1.pddl", "instance-2.pddl"]),
+        execution_mode="bdi",
+    )
+
+    assert gate_sizes == [30, 30]
+
+
+def test_append_after_torn_checkpoint_tail_drops_only_the_fragment(tmp_path: Path):
+    from scripts.evaluation import run_planbench_paperaligned as runner
+
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    checkpoint.write_bytes(b'{"instance_file": "a"}\n{"instance_fi')
+
+    with runner.open_checkpoint_for_append(str(checkpoint)) as fh:
+        runner.append_checkpoint_record(fh, {"instance_file": "b"})
+
+    assert [r["instance_file"] for r in runner.iter_checkpoint_records(str(checkpoint))] == ["a", "b"]
+
+
+def test_append_keeps_complete_unterminated_checkpoint_record(tmp_path: Path):
+    from scripts.evaluation import run_planbench_paperaligned as runner
+
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    checkpoint.write_bytes(b'{"instance_file": "a"}\n{"instance_file": "b"}')
+
+    with runner.open_checkpoint_for_append(str(checkpoint)) as fh:
+        runner.append_checkpoint_record(fh, {"instance_file": "c"})
+
+    assert [r["instance_file"] for r in runner.iter_checkpoint_records(str(checkpoint))] == ["a", "b", "c"]
+
+
+def test_run_batch_evaluation_resumes_jsonl_checkpoint_in_place(tmp_path: Path, monkeypatch):
+    import json
+
+    from scripts.evaluation import run_planbench_paperaligned as runner
+
+    monkeypatch.setattr(runner, "MLFLOW_AVAILABLE", False)
+    evaluated = []
+
+    def fake_evaluate(*args):
+        evaluated.append(Path(args[0]).name)
+        return _fake_instance_result(*args)
+
+    monkeypatch.setattr(runner, "evaluate_single_instance", fake_evaluate)
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    instances_file = _instances_file(tmp_path, ["instance-1.pddl", "instance-2.pddl"])
+    done = _fake_instance_result(str(tmp_path / "instance-1.pddl"), "blocksworld", "bdi")
+    checkpoint = Path(runner.checkpoint_path(str(output_dir), "blocksworld", "bdi"))
+    checkpoint.write_text(json.dumps(done) + '\n{"instance_file": "torn')
+
+    results = runner.run_batch_evaluation(
+        "blocksworld", output_dir=str(output_dir), instances_file=instances_file, execution_mode="bdi"
+    )
+
+    assert evaluated == ["instance-2.pddl"]
+    assert len(results["results"]) == 2
+    records = list(runner.iter_checkpoint_records(str(checkpoint)))
+    assert [Path(r["instance_file"]).name for r in records] == ["instance-1.pddl", "instance-2.pddl"]
+
+
+def test_result_store_hits_only_for_matching_domain_file_and_generation_config(tmp_path: Path, monkeypatch):
+    import os
+
+    from scripts.evaluation import run_planbench_paperaligned as runner
+
+    domain_file = tmp_path / "domain.pddl"
+    domain_file.write_text("(define (domain blocksworld))")
+    instance = tmp_path / "instance-1.pddl"
+    instance.write_text("(define (problem p1) (:domain blocksworld))")
+    monkeypatch.setattr(runner, "resolve_domain_file", lambda name: str(domain_file))
+    conn = runner.open_result_store(str(tmp_path))
+    result = _fake_instance_result(str(instance), "blocksworld", "bdi")
+
+    runner.store_completed_result(conn, "blocksworld", "bdi", "bdi_initial_result", result)
+    assert runner.load_stored_result(conn, "blocksworld", "bdi", str(instance)) == result
+
+    temperature = runner.Config.TEMPERATURE
+    monkeypatch.setattr(runner.Config, "TEMPERATURE", temperature + 0.5)
+    assert runner.load_stored_result(conn, "blocksworld", "bdi", str(instance)) is None
+    monkeypatch.setattr(runner.Config, "TEMPERATURE", temperature)
+    assert runner.load_stored_result(conn, "blocksworld", "bdi", str(instance)) == result
+
+    stat = domain_file.stat()
+    os.utime(domain_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert runner.load_stored_result(conn, "blocksworld", "bdi", str(instance)) is None
+    conn.close()
+
+
+def test_reuse_results_skips_instances_completed_by_an_earlier_run(tmp_path: Path, monkeypatch):
+    import os
+
+    from scripts.evaluation import run_planbench_paperaligned as runner
+
+    monkeypatch.setattr(runner, "MLFLOW_AVAILABLE", False)
+    evaluated = []
+
+    def fake_evaluate(*args):
+        evaluated.append(Path(args[0]).name)
+        return _fake_instance_result(*args)
+
+    monkeypatch.setattr(runner, "evaluate_single_instance", fake_evaluate)
+    output_dir = str(tmp_path / "out")
+    instances_file = _instances_file(tmp_path, ["instance-1.pddl"])
+
+    def run():
+        return runner.run_batch_evaluation(
+            "blocksworld", output_dir=output_dir, instances_file=instances_file, execution_mode="bdi", reuse_results=True
+        )
+
+    run()
+    os.remove(runner.checkpoint_path(output_dir, "blocksworld", "bdi"))  # rule out checkpoint auto-resume
+    results = run()
+
+    assert evaluated == ["instance-1.pddl"]
+    assert results["results"][0]["result_store_hit"] is True
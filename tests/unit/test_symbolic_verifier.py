@@ -121,3 +121,20 @@ class TestPDDLSymbolicVerifier:
         is_valid, errors = verifier.verify_plan("d.pddl", "p.pddl", ["(action)"])
         assert is_valid is False
         assert "VAL execution error" in errors[0]
+
+    @patch("subprocess.run")
+    def test_context_manager_reuses_plan_file(self, mock_run, verifier):
+        mock_process = MagicMock()
+        mock_process.stdout = "Plan executed successfully - checking goal\nPlan valid\n"
+        mock_process.stderr = ""
+        mock_run.return_value = mock_process
+
+        with verifier as val:
+            val.verify_plan("d.pddl", "p.pddl", ["(pick-up a)"])
+            val.verify_plan("d.pddl", "p.pddl", ["(pick-up b)", "(stack b a)"])
+            plan_files = [call.args[0][-1] for call in mock_run.call_args_list]
+            assert plan_files[0] == plan_files[1]
+            with open(plan_files[1]) as f:
+                assert f.read() == "(pick-up b)\n(stack b a)\n"
+
+        assert not os.path.exists(plan_files[0])
@@ -144,6 +144,24 @@ class TestCycleDetection:
         assert is_valid is False
         assert any("cycle" in e.lower() for e in errors)
 
+    def test_reported_cycle_skips_acyclic_prefix(self):
+        """Only the nodes of the cycle itself are reported, not the chain feeding into it."""
+        plan = BDIPlan(
+            goal_description="Tail into cycle",
+            nodes=[ActionNode(id=n, action_type="Action", description=n) for n in ("start", "A", "B", "C")],
+            edges=[
+                DependencyEdge(source="start", target="A"),
+                DependencyEdge(source="A", target="B"),
+                DependencyEdge(source="B", target="C"),
+                DependencyEdge(source="C", target="A"),
+            ],
+        )
+        result = PlanVerifier.verify(plan.to_networkx())
+
+        (cycle_error,) = result.hard_errors
+        reported = cycle_error.removeprefix("Cycle detected: ").split(" -> ")
+        assert sorted(reported) == ["A", "B", "C"]
+
     def test_self_loop_detected(self):
         """A -> A (self-loop) should fail."""
         plan = BDIPlan(
@@ -233,6 +251,39 @@ class TestTopologicalSort:
 
         assert order == []
 
+    def test_verify_and_sort_matches_separate_calls(self):
+        """verify_and_sort should agree with verify and topological_sort."""
+        for edges in ([("A", "B"), ("B", "C")], [("A", "B"), ("B", "A")], [("A", "ghost")]):
+            plan = BDIPlan(
+                goal_description="Combined",
+                nodes=[ActionNode(id=n, action_type="X", description=n) for n in ("A", "B", "C")],
+                edges=[DependencyEdge(source=s, target=t) for s, t in edges],
+            )
+            G = plan.to_networkx()
+
+            result, order = PlanVerifier.verify_and_sort(G)
+
+            assert result == PlanVerifier.verify(G)
+            assert order == PlanVerifier.topological_sort(G)
+
+    def test_cached_verdict_is_a_fresh_copy_and_tracks_mutation(self):
+        """Re-verifying returns an independent result and sees later graph edits."""
+        plan = BDIPlan(
+            goal_description="Cached",
+            nodes=[ActionNode(id=n, action_type="X", description=n) for n in ("A", "B", "C")],
+            edges=[DependencyEdge(source="A", target="B"), DependencyEdge(source="B", target="C")],
+        )
+        G = plan.to_networkx().copy()
+
+        first = PlanVerifier.verify(G)
+        first.warnings.append("caller note")
+        assert PlanVerifier.verify(G) == VerificationResult(is_valid=True)
+
+        G.add_edge("C", "A")
+        result, order = PlanVerifier.verify_and_sort(G)
+        assert not result.is_valid
+        assert order == []
+
 
 class TestCycleDetectionEnhanced:
     """Enhanced cycle detection tests."""
@@ -672,5 +723,51 @@ class TestVisualizerEdgeCases:
             PlanVisualizer.compare_plans({})
 
 
+class TestGraphMemoisation:
+    """to_networkx() reuses its graph until nodes/edges change."""
+
+    def _plan(self):
+        return BDIPlan(
+            goal_description="Two steps",
+            nodes=[
+                ActionNode(id="a", action_type="Navigate", description="A"),
+                ActionNode(id="b", action_type="PickUp", description="B"),
+            ],
+            edges=[DependencyEdge(source="a", target="b")],
+        )
+
+    def test_repeated_calls_share_graph(self):
+        plan = self._plan()
+        assert plan.to_networkx() is plan.to_networkx()
+
+    def test_memoised_graph_does_not_affect_equality(self):
+        plan = self._plan()
+        plan.to_networkx()
+        assert plan == self._plan()
+
+    def test_list_mutation_rebuilds_graph(self):
+        plan = self._plan()
+        first = plan.to_networkx()
+        plan.nodes.append(ActionNode(id="c", action_type="Place", description="C"))
+        plan.edges.append(DependencyEdge(source="b", target="c"))
+
+        second = plan.to_networkx()
+
+        assert second is not first
+        assert set(second.nodes) == {"a", "b", "c"}
+        assert second.has_edge("b", "c")
+
+    def test_reassignment_and_invalidate_rebuild_graph(self):
+        plan = self._plan()
+        first = plan.to_networkx()
+        plan.edges = []
+        assert plan.to_networkx().number_of_edges() == 0
+
+        plan.nodes[0].description = "edited"
+        plan.invalidate_graph_cache()
+        assert plan.to_networkx().nodes["a"]["description"] == "edited"
+        assert first.number_of_edges() == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])